@@ -1,49 +1,51 @@
 # ai.py
-import collections
+import time
 from settings import *
+from pathfinding import PathFinder, DistanceField
+
+# Strategies that can produce a move, worst to best; AutoPilot.last_tier names one of them
+MOVE_TIERS = ('trapped', 'unsafe', 'safe', 'tail', 'food', 'cached')
 
 class AutoPilot:
     """AI Logic for controlling the snake."""
 
-    def __init__(self, grid_width, grid_height):
+    def __init__(self, grid_width, grid_height, verbose=True, time_budget=None):
         self.grid_width = grid_width
         self.grid_height = grid_height
-        self.cached_path = None # Optional: Cache path to food if still valid
+        self.verbose = verbose # Headless runs turn off the console warnings
+        self.time_budget = time_budget # Seconds per move, None for no limit (see _anytime_move)
+        self.last_tier = None # Which strategy produced the last move, see MOVE_TIERS
+        self._tier_cost = {} # Tier -> smoothed seconds its searches took, for budgeting
+        self.cached_path = None # Cells of the last safe path to food, followed while still valid
+        self._cached_step = 0 # Index of the next cell to take in cached_path
+        self._cached_food = -1 # Food cell the cached path leads to
+        self.cache_hits = 0 # Ticks answered from the cached path
+        self.cache_misses = 0 # Ticks that had to plan from scratch
+        self.finder = PathFinder(grid_width, grid_height) # Reused across calls, no per-search allocation
+        self.head_field = DistanceField(grid_width * grid_height) # Refilled by each tick's analysis
+        self.last_analysis = None # TickAnalysis of the most recent get_next_move call
+        self.trapped = False # True when the last move was made with no valid move left
 
     def _is_valid(self, point):
         """Check if a point is within the grid boundaries."""
         x, y = point
         return 0 <= x < self.grid_width and 0 <= y < self.grid_height
 
-    def _get_neighbors(self, point):
-        """Get valid neighbor cells for a given point."""
-        x, y = point
-        neighbors = []
-        # Order matters slightly for fallback - prefer cardinal directions
-        for dx, dy in [UP, DOWN, LEFT, RIGHT]:
-            neighbor = (x + dx, y + dy)
-            # No need to check validity here, BFS/callers will do it
-            neighbors.append(neighbor)
-        return neighbors
-
-    def _reconstruct_path(self, came_from, start, end):
-        """Helper to reconstruct path from BFS 'came_from' dictionary."""
-        path = []
-        current = end
-        if current not in came_from and current != start: # Target unreachable
-             return None
-        while current != start:
-            path.append(current)
-            # Check if current is actually in came_from before accessing
-            if current not in came_from:
-                # This can happen if start == end, or unexpected BFS state
-                # For start == end, path should be empty, handled earlier.
-                # If it happens otherwise, indicates an issue.
-                print(f"AI Path Reconstruction Error: {current} not in came_from map.")
-                return None # Indicate error or inability to reconstruct
-            current = came_from[current]
-        path.reverse() # Path is from end to start, reverse it
-        return path
+    def _blocked_from_points(self, points):
+        """Builds a blocked-cell grid from a collection of (x, y) points, ignoring off-grid ones."""
+        blocked = bytearray(self.grid_width * self.grid_height)
+        for point in points:
+            if self._is_valid(point):
+                blocked[point[1] * self.grid_width + point[0]] = 1
+        return blocked
+
+    def _to_points(self, cells):
+        return [(cell % self.grid_width, cell // self.grid_width) for cell in cells]
+
+    def _direction_to(self, from_cell, to_cell):
+        """Direction tuple for a step between two adjacent cells."""
+        width = self.grid_width
+        return (to_cell % width - from_cell % width, to_cell // width - from_cell // width)
 
 
     def find_path_bfs(self, start, end, obstacles):
@@ -53,34 +55,11 @@ class AutoPilot:
         Returns the path as a list of points (excluding start), or None if no path exists.
         """
         if not self._is_valid(start) or not self._is_valid(end):
-             # print(f"BFS Invalid start {start} or end {end}")
              return None
-        if start == end:
-             # print("BFS Start == End")
-             return [] # No path needed, already there
-
-        queue = collections.deque([start])
-        visited = set(obstacles) # Treat obstacles as already visited
-        visited.add(start)
-        came_from = {} # Dictionary to store path: {node: previous_node}
-
-        while queue:
-            current = queue.popleft()
-
-            if current == end:
-                # print(f"BFS Path found from {start} to {end}")
-                return self._reconstruct_path(came_from, start, end)
-
-            # Explore neighbors
-            # Order matters slightly if multiple shortest paths exist, but BFS guarantees shortest
-            for neighbor in self._get_neighbors(current):
-                if self._is_valid(neighbor) and neighbor not in visited:
-                    visited.add(neighbor)
-                    came_from[neighbor] = current # Record where we came from
-                    queue.append(neighbor)
-
-        # print(f"BFS No path found from {start} to {end}")
-        return None # No path found
+        width = self.grid_width
+        path = self.finder.bfs(start[1] * width + start[0], end[1] * width + end[0],
+                               self._blocked_from_points(obstacles))
+        return None if path is None else self._to_points(path)
 
 
     def _can_reach_tail(self, start_node, snake_body_list, grid_width, grid_height):
@@ -91,41 +70,93 @@ class AutoPilot:
         """
         if len(snake_body_list) <= 1:
              return True # Snake is too short to trap itself
+        if not self._is_valid(start_node):
+             return False # Off the board is a wall collision
 
-        future_head = start_node # This is the proposed next head position
+        # Obstacles for this check are the future body *except* the tail
         future_tail = snake_body_list[0]
+        blocked = self._blocked_from_points(snake_body_list[1:])
+        width = self.grid_width
+        return self.finder.reachable(start_node[1] * width + start_node[0],
+                                     future_tail[1] * width + future_tail[0], blocked)
 
-        # Obstacles for this check are the future body *except* the tail
-        # and the walls.
-        obstacles = set(snake_body_list[1:]) # All segments except the actual tail end
-        
-        # Add walls
-        for x in range(grid_width):
-             obstacles.add((x, -1)); obstacles.add((x, grid_height))
-        for y in range(grid_height):
-             obstacles.add((-1, y)); obstacles.add((grid_width, y))
-
-
-        # Perform BFS from the future head to the future tail
-        queue = collections.deque([future_head])
-        visited = set(obstacles)
-        visited.add(future_head) # Start node is visited
-
-        while queue:
-            current = queue.popleft()
-            if current == future_tail:
-                # print(f"Safety Check: Tail {future_tail} REACHABLE from {future_head}")
-                return True # Tail found!
-
-            for neighbor in self._get_neighbors(current):
-                # Check bounds AND if it's not an obstacle OR if it IS the tail
-                # (Need to allow reaching the tail square itself)
-                if self._is_valid(neighbor) and neighbor not in visited:
-                     visited.add(neighbor)
-                     queue.append(neighbor)
-
-        # print(f"Safety Check: Tail {future_tail} UNREACHABLE from {future_head}")
-        return False # BFS finished without finding tail
+    def _tail_reachable_after(self, snake, next_cell):
+        """
+        Same safety check as _can_reach_tail, for the snake's own next move.
+        Applies the move to the occupancy grid in place, searches, then undoes it,
+        so no body copy or obstacle set is built.
+        """
+        growing = snake.growing
+        if snake.length + (1 if growing else 0) <= 1:
+            return True # Snake is too short to trap itself
+
+        occupancy = snake.occupancy
+        old_tail = snake.get_tail_cell()
+        # The future tail stays put while growing, otherwise it moves up one segment
+        future_tail = old_tail if growing else snake.get_segment_cell(1)
+
+        occupancy[next_cell] += 1
+        if not growing:
+            occupancy[old_tail] -= 1
+        reachable = self.finder.reachable(next_cell, future_tail, occupancy, future_tail)
+        if not growing:
+            occupancy[old_tail] += 1
+        occupancy[next_cell] -= 1
+        return reachable
+
+    def _path_keeps_tail_reachable(self, snake, path):
+        """
+        Checks that the tail is still reachable once the snake has followed the whole path.
+        Walks a virtual snake along the path on the occupancy grid and undoes it afterwards,
+        so a path that passes this check can be followed without re-checking every tick.
+        """
+        occupancy = snake.occupancy
+        growing = snake.growing
+        length = snake.length
+        future_length = length + (1 if growing else 0)
+        # Body segment i from the tail, extended by the path cells
+        segment = lambda i: snake.get_segment_cell(i) if i < length else path[i - length]
+
+        tail_index = 0
+        for i, cell in enumerate(path):
+            occupancy[cell] += 1
+            if not (growing and i == 0):
+                occupancy[segment(tail_index)] -= 1
+                tail_index += 1
+        future_tail = segment(tail_index)
+        reachable = future_length <= 1 or self.finder.reachable(path[-1], future_tail, occupancy, future_tail)
+
+        # Undo the virtual walk
+        for i in range(len(path) - 1, -1, -1):
+            if not (growing and i == 0):
+                tail_index -= 1
+                occupancy[segment(tail_index)] += 1
+            occupancy[path[i]] -= 1
+        return reachable
+
+    def _distance(self, from_cell, to_cell):
+        """Manhattan distance between two cells."""
+        width = self.grid_width
+        return abs(from_cell % width - to_cell % width) + abs(from_cell // width - to_cell // width)
+
+    def _follow_cached_path(self, head, food_cell, occupancy, passable):
+        """
+        Returns the next cell of the cached food path if it is still usable, else None.
+        Only O(1) checks: the snake is where the path expects, the food has not moved
+        and the next cell is still free. Safety of the whole path was checked when it
+        was cached (see _path_keeps_tail_reachable).
+        """
+        path = self.cached_path
+        if path is None or food_cell != self._cached_food:
+            return None
+        step = self._cached_step
+        if step >= len(path) or path[step - 1] != head:
+            return None
+        next_cell = path[step]
+        if occupancy[next_cell] and next_cell != passable:
+            return None
+        self._cached_step = step + 1
+        return next_cell
 
     def get_next_move(self, snake, food):
         """
@@ -133,156 +164,280 @@ class AutoPilot:
         Prioritizes:
         1. Safe path to food.
         2. Path to own tail (survival mode).
-        3. Any valid move if trapped.
+        3. The move into the most room, preferring room with the tail in reach.
         Returns a direction tuple (e.g., UP, DOWN, LEFT, RIGHT) or None if no move possible.
+        All graph searches for the tick go through one TickAnalysis (see last_analysis).
         """
-        head = snake.get_head_position()
-        current_body = snake.get_body() # List of positions, head is last element
-        food_pos = food.position
-
-        # --- Define Obstacles for General Movement ---
-        # Obstacles are walls and the snake's body *excluding the head itself*.
-        # The tail square *can* be moved into in the next step if the snake isn't growing.
-        obstacles = set(current_body[1:]) # Body excluding head
-        if not snake.growing and len(current_body) > 1:
-             tail = current_body[0]
-             if tail in obstacles:
-                 obstacles.remove(tail) # Allow moving into the square the tail *will* vacate
-
-        # Add virtual walls as obstacles for pathfinding
-        for x in range(-1, self.grid_width + 1):
-            obstacles.add((x, -1)); obstacles.add((x, self.grid_height))
-        for y in range(-1, self.grid_height + 1):
-             obstacles.add((-1, y)); obstacles.add((self.grid_width, y))
+        self.trapped = False
+        food_cell = -1 if food.position is None else food.position[1] * self.grid_width + food.position[0]
+        analysis = self.last_analysis = TickAnalysis(self, snake, food_cell)
+        head = analysis.head
+
+
+        # --- Strategy 0: Keep following the food path from an earlier tick ---
+        next_cell = self._follow_cached_path(head, food_cell, analysis.occupancy, analysis.passable)
+        if next_cell is not None:
+             self.cache_hits += 1
+             self.last_tier = 'cached'
+             return self._direction_to(head, next_cell)
+        self.cache_misses += 1
+        self.cached_path = None # Broken, finished or stale: plan again below
+
+        if self.time_budget is not None:
+            return self._anytime_move(snake, analysis, time.perf_counter() + self.time_budget)
 
 
         # --- Strategy 1: Find shortest path to food ---
-        # print(f"\nAI Turn --- Head: {head}, Food: {food_pos}, Body Len: {len(current_body)}")
-        # print(f"Obstacles for food path: {obstacles}")
-        path_to_food = self.find_path_bfs(head, food_pos, obstacles)
-
-        safe_food_move_found = False
-        if path_to_food is not None: # Note: BFS returns [] if start==end, so check not None
-             if len(path_to_food) > 0:
-                 next_head_pos = path_to_food[0]
-                 # print(f"AI: Path to food found: {path_to_food}")
-
-                 # --- Safety Check ---
-                 # Simulate the snake's body *after* making this move
-                 potential_body = list(current_body) # Make a copy
-                 potential_body.append(next_head_pos)
-                 if not snake.growing:
-                      potential_body.pop(0) # Tail disappears if not growing
-
-                 # Check if the *future* tail is reachable from the *proposed* head
-                 if self._can_reach_tail(next_head_pos, potential_body, self.grid_width, self.grid_height):
-                      # print(f"AI: Move to {next_head_pos} towards food is SAFE.")
-                      move = (next_head_pos[0] - head[0], next_head_pos[1] - head[1])
-                      safe_food_move_found = True
-                      # Keep this move, but check survival strategy just in case
-                 else:
-                      # print(f"AI: Move to {next_head_pos} towards food is UNSAFE (tail unreachable).")
-                      path_to_food = None # Discard this path as unsafe
-             else: # Path is empty, meaning head is already at food pos (shouldn't happen before move)
-                 # This case might indicate an edge condition or bug.
-                 # If head == food, game logic should handle eating before AI runs again.
-                 # For safety, treat as no path found.
-                 # print("AI WARNING: Path to food is empty, head may already be at food?")
-                 path_to_food = None
-
-
-        # --- Strategy 1b: If safe food path found, use it ---
-        if safe_food_move_found:
-             next_head_pos = path_to_food[0]
-             move = (next_head_pos[0] - head[0], next_head_pos[1] - head[1])
-             # print(f"AI: Action -> Move towards food: {move}")
-             return move
+        path_to_food = analysis.food_path()
+
+        # Note: the path is [] if head == food, treat that as no path found
+        if path_to_food:
+             next_cell = path_to_food[0]
+
+             # --- Safety Check ---
+             # If the tail is still reachable at the end of the path, remember the
+             # path so the following ticks can just follow it
+             if analysis.path_keeps_tail_reachable(path_to_food):
+                  self._cache_path(path_to_food, food_cell)
+                  self.last_tier = 'food'
+                  return self._direction_to(head, next_cell)
+             # Otherwise check if the *future* tail is reachable from the *proposed* head
+             if analysis.move_keeps_tail_reachable(next_cell):
+                  self.last_tier = 'food'
+                  return self._direction_to(head, next_cell)
 
 
         # --- Strategy 2: Path to food unsafe or not found - Follow tail (Survival) ---
-        # print("AI: Path to food not found or unsafe. Seeking tail...")
-        if len(current_body) > 0:
-             tail_pos = current_body[0]
-
-             # Obstacles for tail path: Body excluding head AND excluding the tail itself
-             # (since we want to *reach* the tail square)
-             tail_obstacles = set(current_body[1:-1]) # Exclude head and tail
-
-             # Add walls
-             for x in range(-1, self.grid_width + 1):
-                 tail_obstacles.add((x, -1)); tail_obstacles.add((x, self.grid_height))
-             for y in range(-1, self.grid_height + 1):
-                  tail_obstacles.add((-1, y)); tail_obstacles.add((self.grid_width, y))
-
-             # print(f"Obstacles for tail path: {tail_obstacles}")
-             path_to_tail = self.find_path_bfs(head, tail_pos, tail_obstacles)
-
-             if path_to_tail and len(path_to_tail) > 0:
-                  next_head_pos = path_to_tail[0]
-                  # We generally assume moving towards the tail is safe enough,
-                  # but a strict AI could run _can_reach_tail check here too.
-                  # Let's skip the extra check for performance/simplicity for now.
-                  move = (next_head_pos[0] - head[0], next_head_pos[1] - head[1])
-                  # print(f"AI: Action -> Move towards tail: {move}")
-                  return move
-             # else:
-                  # print("AI: No path found to tail.")
-        # else:
-             # print("AI: Cannot seek tail, snake too short.")
-
-
-        # --- Strategy 3: No path to food or tail - Make *any* valid move ---
-        # print("AI: No optimal path found. Attempting any valid adjacent move...")
-        current_direction = snake.direction
-        # Define potential moves, maybe prioritize non-reversing ones
-        potential_directions = [UP, DOWN, LEFT, RIGHT]
-        # Filter out the reverse direction immediately
-        reverse_direction = (-current_direction[0], -current_direction[1])
-        valid_moves = []
-
-        # Check neighbors in a preferred order (e.g., straight, left, right)
-        preferred_order = [current_direction] # Try going straight first
-        if current_direction in [UP, DOWN]:
-            preferred_order.extend([LEFT, RIGHT])
-        else: # LEFT or RIGHT
-             preferred_order.extend([UP, DOWN])
-        # Add the reverse direction last, only as absolute fallback (though usually blocked)
-        # preferred_order.append(reverse_direction) # Usually blocked by body
-
-
-        for move in preferred_order:
-             next_head_pos = (head[0] + move[0], head[1] + move[1])
-             # Check if the move is valid (within bounds) and not hitting the snake's body
-             # Use the original 'obstacles' set which includes walls and body (minus maybe tail)
-             if self._is_valid(next_head_pos) and next_head_pos not in obstacles:
-                 # Check safety (tail reachability) for this fallback move too!
-                 potential_body = list(current_body)
-                 potential_body.append(next_head_pos)
-                 if not snake.growing:
-                     potential_body.pop(0)
-
-                 if self._can_reach_tail(next_head_pos, potential_body, self.grid_width, self.grid_height):
-                     # print(f"AI: Action -> Fallback SAFE move: {move}")
-                     return move
-                 # else:
-                     # print(f"AI: Fallback move {move} to {next_head_pos} is unsafe.")
-
-
-        # --- Strategy 4: Completely trapped ---
-        # If we reach here, no safe move was found by any strategy.
-        # The snake is likely boxed in. Let it make *any* move into an adjacent square
-        # even if it's unsafe (can't reach tail), just to avoid immediate wall/body collision if possible.
-        # If even that fails, it will collide.
-        print("AI: WARNING - No SAFE fallback move found. Trying any valid non-colliding move.")
-        for move in potential_directions:
-             if move == reverse_direction and len(current_body) > 1: continue # Avoid instant 180 unless length 1
-             next_head_pos = (head[0] + move[0], head[1] + move[1])
-             if self._is_valid(next_head_pos) and next_head_pos not in obstacles:
-                 print(f"AI: Action -> Fallback UNSAFE BUT VALID move: {move}")
-                 return move # Take the first valid (but maybe unsafe) move
-
-        # --- Strategy 5: Truly No Way Out ---
-        print("AI: CRITICAL - Trapped! No valid moves possible.")
+        path_to_tail = analysis.tail_path()
+        # A growing snake's tail stays put, so a path ending on it may not be walkable yet
+        if path_to_tail and analysis.is_free(path_to_tail[0]):
+             self.last_tier = 'tail'
+             return self._direction_to(head, path_to_tail[0])
+
+
+        # --- Strategy 3: No path to food or tail - Move into the most room ---
+        # One labeling pass scores every candidate by the free region it leads into;
+        # room with the tail in reach is safe, otherwise the largest region buys time.
+        candidates = self._candidate_cells(snake, analysis)
+        if candidates:
+             next_cell, safe = self._roomiest_move(analysis, candidates)
+             if safe:
+                 self.last_tier = 'safe'
+             else:
+                 if self.verbose:
+                     print("AI: WARNING - No SAFE fallback move found. Taking the move into the most room.")
+                 self.last_tier = 'unsafe'
+             return self._direction_to(head, next_cell)
+
+        # --- Strategy 4: Truly No Way Out ---
+        self.trapped = True
+        self.last_tier = 'trapped'
+        if self.verbose:
+            print("AI: CRITICAL - Trapped! No valid moves possible.")
         # Return the current direction - this will likely cause a collision on the next step,
         # which is the expected outcome if truly trapped.
-        return snake.direction
\ No newline at end of file
+        return snake.direction
+
+    def _candidate_cells(self, snake, analysis):
+        """Free cells next to the head, straight ahead first, then the sides (and back at length 1)."""
+        direction = snake.direction
+        if direction in (UP, DOWN):
+            preferred = [direction, LEFT, RIGHT]
+        else:
+            preferred = [direction, UP, DOWN]
+        if snake.length == 1:
+            preferred.append((-direction[0], -direction[1]))
+        directions = [UP, DOWN, LEFT, RIGHT] # Same order as the neighbor table
+        return [cell for cell in (analysis.neighbor(directions.index(move)) for move in preferred)
+                if analysis.is_free(cell)]
+
+    def _roomiest_move(self, analysis, candidates):
+        """
+        The first candidate whose free region has the tail in reach, or else the one
+        leading into the largest region. Returns (cell, tail in reach).
+        """
+        scores = analysis.regions(candidates)
+        best = max(range(len(candidates)), key=lambda i: (scores[i][1], scores[i][0], -i))
+        return candidates[best], scores[best][1]
+
+    def _cache_path(self, path, food_cell):
+        """Remembers a food path that passed the whole-path safety check."""
+        self.cached_path = path
+        self._cached_step = 1
+        self._cached_food = food_cell
+
+    def _fits_budget(self, tier, deadline):
+        """
+        Checks whether a tier's searches are expected to finish before the deadline.
+        A skipped tier's estimate decays, so it is retried once the board allows it.
+        """
+        cost = self._tier_cost.get(tier, 0.0)
+        if time.perf_counter() + cost <= deadline:
+            return True
+        self._tier_cost[tier] = cost * 0.9
+        return False
+
+    def _timed(self, tier, search, *args):
+        """Runs a tier's search and updates the tier's smoothed cost."""
+        started = time.perf_counter()
+        result = search(*args)
+        elapsed = time.perf_counter() - started
+        self._tier_cost[tier] = 0.8 * self._tier_cost.get(tier, elapsed) + 0.2 * elapsed
+        return result
+
+    def _anytime_move(self, snake, analysis, deadline):
+        """
+        Move selection within a time budget. A move that does not collide right away is
+        picked first with no search; then the best tier whose expected cost still fits
+        before the deadline is tried (food, then tail), and the region scoring of the
+        candidates is the last upgrade when those do not fit or fail. A search that has
+        started always finishes, so the budget is a target rather than a hard limit.
+        """
+        head = analysis.head
+        direction = snake.direction
+        candidates = self._candidate_cells(snake, analysis)
+
+        # --- Tier 'unsafe': any move that does not collide right away ---
+        if not candidates:
+            self.trapped = True
+            self.last_tier = 'trapped'
+            return direction
+        self.last_tier = 'unsafe'
+
+        # --- Tier 'food': a safe path to the food ---
+        if self._fits_budget('food', deadline):
+            path = self._timed('food', self._safe_food_path, analysis)
+            if path:
+                self.last_tier = 'food'
+                return self._direction_to(head, path[0])
+
+        # --- Tier 'tail': follow the tail, reuses the food tier's head field if it ran ---
+        if self._fits_budget('tail', deadline):
+            path = self._timed('tail', analysis.tail_path)
+            if path and analysis.is_free(path[0]):
+                self.last_tier = 'tail'
+                return self._direction_to(head, path[0])
+
+        # --- Tier 'safe': the move into the most room, one labeling pass for all candidates ---
+        if self._fits_budget('safe', deadline):
+            cell, safe = self._timed('safe', self._roomiest_move, analysis, candidates)
+            if safe:
+                self.last_tier = 'safe'
+            return self._direction_to(head, cell) # Unsafe, but into the largest region
+        return self._direction_to(head, candidates[0])
+
+    def _safe_food_path(self, analysis):
+        """Food path whose first step (or, to be cached, the whole path) keeps the tail reachable."""
+        path = analysis.food_path()
+        if not path:
+            return None
+        if analysis.path_keeps_tail_reachable(path):
+            self._cache_path(path, analysis.food_cell)
+            return path
+        if analysis.move_keeps_tail_reachable(path[0]):
+            return path
+        return None
+
+    def planned_path(self):
+        """
+        The food path the AI is currently following, as (x, y) points, for the debug overlay.
+        Read from the cache or this tick's analysis, so it never triggers a search.
+        """
+        if self.cached_path is not None:
+            return self._to_points(self.cached_path[self._cached_step - 1:])
+        if self.last_analysis is not None:
+            path = self.last_analysis.food_path(compute=False)
+            if path is not None:
+                return self._to_points(path)
+        return None
+
+
+class TickAnalysis:
+    """
+    The shared view of one tick that all AutoPilot strategies read from.
+    Each search (head distance field, food path, tail-safety checks) runs at most once,
+    lazily, and `traversals` counts the graph searches the tick actually needed.
+    """
+
+    _NOT_COMPUTED = object()
+
+    def __init__(self, pilot, snake, food_cell):
+        self.pilot = pilot
+        self.finder = pilot.finder
+        self.snake = snake
+        self.head = snake.get_head_cell()
+        self.tail = snake.get_tail_cell()
+        self.food_cell = food_cell
+        self.occupancy = snake.occupancy # Segment count per cell; walls are simply off the grid
+        # The tail square *can* be moved into next step if the snake isn't growing
+        self.passable = self.tail if not snake.growing and snake.length > 1 else -1
+        self._start_traversals = self.finder.traversals
+        self._field_ready = False
+        self._food_path = self._NOT_COMPUTED
+        self._path_safe = self._NOT_COMPUTED
+        self._move_safe = {} # Next head cell -> tail still reachable
+
+    @property
+    def traversals(self):
+        """Number of graph searches run for this tick so far."""
+        return self.finder.traversals - self._start_traversals
+
+    def neighbor(self, k):
+        """Neighbor k of the head (UP, DOWN, LEFT, RIGHT order), or -1 off the board."""
+        return self.finder.graph.neighbors[4 * self.head + k]
+
+    def is_free(self, cell):
+        """Checks whether the head can move into a cell without hitting a wall or the body."""
+        return cell >= 0 and (not self.occupancy[cell] or cell == self.passable)
+
+    def head_field(self):
+        """BFS distances from the head over free cells. The tail is always reachable as a goal."""
+        if not self._field_ready:
+            self.finder.fill_field(self.pilot.head_field, self.head, self.occupancy,
+                                   self.passable, goal_only=self.tail)
+            self._field_ready = True
+        return self.pilot.head_field
+
+    def food_path(self, compute=True):
+        """
+        Shortest path to the food (excluding the head), or None.
+        Read from the head field if it exists; a distant food uses A* instead of a full fill.
+        """
+        if self._food_path is self._NOT_COMPUTED:
+            if not compute:
+                return None
+            food = self.food_cell
+            if food < 0:
+                self._food_path = None
+            elif not self._field_ready and self.pilot._distance(self.head, food) >= ASTAR_MIN_DISTANCE:
+                self._food_path = self.finder.astar(self.head, food, self.occupancy, self.passable)
+            else:
+                self._food_path = self.head_field().path_to(food)
+        return self._food_path
+
+    def tail_path(self):
+        """Shortest path to the tail square (excluding the head), or None."""
+        return self.head_field().path_to(self.tail)
+
+    def path_keeps_tail_reachable(self, path):
+        """Whole-path safety check for the food path (see AutoPilot._path_keeps_tail_reachable)."""
+        if self._path_safe is self._NOT_COMPUTED:
+            self._path_safe = self.pilot._path_keeps_tail_reachable(self.snake, path)
+        return self._path_safe
+
+    def regions(self, cells):
+        """
+        (region size, tail in reach) for each cell, from one labeling pass (not cached).
+        As in the one-step safety check, the tail to reach is where it will be after the
+        move, and the cell it leaves is free.
+        """
+        snake = self.snake
+        future_tail = self.tail if snake.growing or snake.length == 1 else snake.get_segment_cell(1)
+        return self.finder.label_regions(cells, self.occupancy, self.passable, future_tail)
+
+    def move_keeps_tail_reachable(self, next_cell):
+        """One-step safety check, remembered per candidate cell."""
+        safe = self._move_safe.get(next_cell)
+        if safe is None:
+            safe = self._move_safe[next_cell] = self.pilot._tail_reachable_after(self.snake, next_cell)
+        return safe
@@ -0,0 +1,318 @@
+# arena.py
+import collections
+import random
+from array import array
+from settings import *
+from game_objects import FreeCells
+from pathfinding import get_grid_graph
+
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT) # Same order as the neighbor table
+
+
+class ArenaSnake:
+    """
+    One snake in the arena. The body is a deque of flat cells (tail left, head right);
+    which cells are taken is tracked once for all snakes in Arena.occupancy, so a
+    snake costs memory for its own body only, not for the board.
+    """
+    __slots__ = ('id', 'body', 'direction', 'growing', 'alive', 'score', 'deaths', 'target')
+
+    def __init__(self, snake_id):
+        self.id = snake_id
+        self.body = collections.deque()
+        self.direction = RIGHT
+        self.growing = False
+        self.alive = False
+        self.score = 0 # Food eaten over all lives
+        self.deaths = 0
+        self.target = -1 # Food cell the pilot is heading for
+
+    @property
+    def head(self):
+        return self.body[-1]
+
+    @property
+    def length(self):
+        return len(self.body)
+
+
+class Arena:
+    """
+    Many snakes and many food items on one board.
+    occupancy counts the snake segments on each cell across all snakes, food marks food
+    cells, and free_cells indexes the cells holding neither, so collision checks and
+    spawning are O(1) whatever the board size. Each tick every snake picks a move from
+    the same board, then all heads are resolved together: tails that move on are freed
+    first, a head dies entering a taken cell or a cell another head enters too, and
+    the survivors move in. The board wraps around at the edges like GameEngine.
+    Dead snakes respawn as a single segment on a random free cell unless respawn is off.
+    """
+
+    def __init__(self, grid_width=ARENA_WIDTH, grid_height=ARENA_HEIGHT, num_snakes=ARENA_SNAKES,
+                 num_food=ARENA_FOOD, rng=None, respawn=True):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.size = grid_width * grid_height
+        self.rng = rng if rng is not None else random
+        self.respawn = respawn
+        self.num_food = num_food
+        self.graph = get_grid_graph(grid_width, grid_height)
+        self.occupancy = bytearray(self.size) # Snake segments per cell, all snakes together
+        self.heads = bytearray(self.size) # 1 on cells holding a head, for pilots avoiding head-on crashes
+        self.food = bytearray(self.size) # 1 on cells holding food
+        self.food_cells = [] # The food cells, for sampling targets (swap-remove, see _food_slots)
+        self._food_slots = {}
+        self.free_cells = FreeCells(self.size) # Neither snake nor food
+        self.ticks = 0
+        self.changed = [] # Cells whose contents changed during the last step, for renderers
+        self.snakes = [ArenaSnake(i) for i in range(num_snakes)]
+        for snake in self.snakes:
+            self._spawn_snake(snake)
+        for _ in range(num_food):
+            self._spawn_food()
+
+    def _spawn_snake(self, snake):
+        cell = self.free_cells.choice(self.rng)
+        if cell is None:
+            return False
+        snake.body.clear()
+        snake.body.append(cell)
+        snake.direction = self.rng.choice(DIRECTIONS)
+        snake.growing = False
+        snake.alive = True
+        snake.target = -1
+        self.occupancy[cell] = 1
+        self.heads[cell] = 1
+        self.free_cells.remove(cell)
+        self.changed.append(cell)
+        return True
+
+    def _spawn_food(self):
+        cell = self.free_cells.choice(self.rng)
+        if cell is None:
+            return False
+        self.food[cell] = 1
+        self._food_slots[cell] = len(self.food_cells)
+        self.food_cells.append(cell)
+        self.free_cells.remove(cell)
+        self.changed.append(cell)
+        return True
+
+    def _eat_food(self, cell):
+        """Removes the food on a cell (the snake's head is moving in, so it stays taken)."""
+        self.food[cell] = 0
+        slot = self._food_slots.pop(cell)
+        last = self.food_cells.pop()
+        if last != cell:
+            self.food_cells[slot] = last
+            self._food_slots[last] = slot
+
+    def _release(self, cell):
+        """Takes one snake segment off a cell."""
+        self.occupancy[cell] -= 1
+        if not self.occupancy[cell] and not self.food[cell]:
+            self.free_cells.add(cell)
+        self.changed.append(cell)
+
+    def _kill(self, snake):
+        snake.alive = False
+        snake.deaths += 1
+        for cell in snake.body:
+            self._release(cell)
+        snake.body.clear()
+
+    def step(self, pilot):
+        """
+        Advances every snake by one tick. pilot(arena, snake) returns each live snake's
+        direction, all decided from the same board before anything moves.
+        Returns the number of snakes alive after the tick.
+        """
+        self.changed = []
+        width, height = self.grid_width, self.grid_height
+        occupancy = self.occupancy
+        live = [snake for snake in self.snakes if snake.alive]
+
+        # Every snake decides on the board as it is
+        moves = []
+        for snake in live:
+            direction = pilot(self, snake)
+            if direction and not (snake.length > 1 and (-direction[0], -direction[1]) == snake.direction):
+                snake.direction = direction # No 180-degree turns, as in Snake.turn
+            head = snake.body[-1]
+            dx, dy = snake.direction
+            moves.append((snake, (head % width + dx) % width + ((head // width + dy) % height) * width))
+
+        # Tails that move on this tick make room before any head moves in
+        for snake, _ in moves:
+            self.heads[snake.body[-1]] = 0
+            if snake.growing:
+                snake.growing = False
+            else:
+                self._release(snake.body.popleft())
+
+        # Resolve all heads together
+        entering = collections.Counter(new_head for _, new_head in moves)
+        dead = [snake for snake, new_head in moves if occupancy[new_head] or entering[new_head] > 1]
+        for snake, new_head in moves:
+            if not occupancy[new_head] and entering[new_head] == 1:
+                snake.body.append(new_head)
+                occupancy[new_head] = 1
+                self.heads[new_head] = 1
+                self.changed.append(new_head)
+                if self.food[new_head]:
+                    self._eat_food(new_head)
+                    snake.growing = True
+                    snake.score += 1
+                else:
+                    self.free_cells.remove(new_head)
+        for snake in dead:
+            self._kill(snake)
+
+        while len(self.food_cells) < self.num_food and self._spawn_food():
+            pass
+        if self.respawn:
+            for snake in dead:
+                self._spawn_snake(snake)
+        self.ticks += 1
+        return sum(1 for snake in self.snakes if snake.alive)
+
+
+class ArenaPilot:
+    """
+    A cheap policy for arena snakes, with a cost per snake that does not depend on the
+    board size or the number of snakes, so planning a tick scales linearly with the snakes.
+    A snake heads for the nearest of a few sampled food items and picks the free
+    neighbor that has room around it (a BFS capped at `space_limit` cells), is not next
+    to another snake's head, and gets closest to the food.
+    """
+
+    def __init__(self, arena, space_limit=ARENA_SPACE_CHECK, food_sample=ARENA_FOOD_SAMPLE, rng=None):
+        self.arena = arena
+        self.space_limit = space_limit
+        self.food_sample = food_sample
+        self.rng = rng if rng is not None else random
+        self.neighbors = arena.graph.neighbors
+        self._stamp = array('I', bytes(4 * arena.size)) # Generation-stamped visited marks, as in PathFinder
+        self._queue = array('i', bytes(4 * (space_limit + 4)))
+        self._generation = 0
+
+    def __call__(self, arena, snake):
+        return self.choose(snake)
+
+    def _distance(self, from_cell, to_cell):
+        width = self.arena.grid_width
+        return abs(from_cell % width - to_cell % width) + abs(from_cell // width - to_cell // width)
+
+    def _pick_target(self, head):
+        food_cells = self.arena.food_cells
+        if not food_cells:
+            return -1
+        sample = [food_cells[self.rng.randrange(len(food_cells))] for _ in range(self.food_sample)]
+        return min(sample, key=lambda cell: self._distance(head, cell))
+
+    def _space(self, start, limit):
+        """Free cells reachable from start, counting up to limit (a capped BFS)."""
+        self._generation += 1
+        generation, stamp, queue = self._generation, self._stamp, self._queue
+        occupancy, neighbors = self.arena.occupancy, self.neighbors
+        stamp[start] = generation
+        queue[0] = start
+        read, write = 0, 1
+        while read < write and write < limit:
+            current = queue[read]
+            read += 1
+            for k in range(4 * current, 4 * current + 4):
+                cell = neighbors[k]
+                if cell >= 0 and not occupancy[cell] and stamp[cell] != generation:
+                    stamp[cell] = generation
+                    queue[write] = cell
+                    write += 1
+        return write
+
+    def choose(self, snake):
+        arena = self.arena
+        head = snake.body[-1]
+        if snake.target < 0 or not arena.food[snake.target]:
+            snake.target = self._pick_target(head)
+        occupancy, heads, neighbors = arena.occupancy, arena.heads, self.neighbors
+        limit = min(self.space_limit, snake.length + 2)
+
+        best_direction, best_key = None, None
+        for k in range(4):
+            cell = neighbors[4 * head + k]
+            if cell < 0 or occupancy[cell]:
+                continue
+            # A cell next to another head may be entered by it this tick too
+            contested = any(neighbors[j] >= 0 and neighbors[j] != head and heads[neighbors[j]]
+                            for j in range(4 * cell, 4 * cell + 4))
+            roomy = self._space(cell, limit) >= limit
+            key = (roomy, not contested, -self._distance(cell, snake.target) if snake.target >= 0 else 0)
+            if best_key is None or key > best_key:
+                best_direction, best_key = DIRECTIONS[k], key
+        return best_direction # None keeps the current direction, the snake is boxed in
+
+
+# --- Command-line runner ---
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Run a multi-snake arena headless, or watch it with --show.")
+    parser.add_argument('--width', type=int, default=ARENA_WIDTH)
+    parser.add_argument('--height', type=int, default=ARENA_HEIGHT)
+    parser.add_argument('--snakes', type=int, default=ARENA_SNAKES)
+    parser.add_argument('--food', type=int, default=ARENA_FOOD)
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--show', action='store_true', help="Draw the arena in a window while it runs")
+    parser.add_argument('--cell', type=int, default=None, help="Pixels per cell with --show")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    arena = Arena(args.width, args.height, args.snakes, args.food, rng=rng)
+    pilot = ArenaPilot(arena, rng=rng)
+
+    view = None
+    if args.show:
+        import pygame
+        cell_size = args.cell or max(1, 800 // max(args.width, args.height))
+        pygame.display.init()
+        view = pygame.display.set_mode((args.width * cell_size, args.height * cell_size))
+        pygame.display.set_caption("Snake Arena")
+        palette = [(rng.randrange(64, 256), rng.randrange(64, 256), rng.randrange(64, 256)) for _ in range(64)]
+
+        def draw_changes():
+            """Repaints the cells the last tick changed; snakes get a color from their head's owner."""
+            owners = {snake.body[i]: snake.id for snake in arena.snakes if snake.alive for i in (-1, 0)}
+            rects = []
+            for cell in arena.changed:
+                rect = pygame.Rect((cell % args.width) * cell_size, (cell // args.width) * cell_size, cell_size, cell_size)
+                if arena.food[cell]:
+                    color = RED
+                elif arena.occupancy[cell]:
+                    color = palette[owners.get(cell, 0) % len(palette)] if cell in owners else GREEN
+                else:
+                    color = BLACK
+                view.fill(color, rect)
+                rects.append(rect)
+            pygame.display.update(rects)
+
+        view.fill(BLACK)
+        arena.changed = [cell for cell in range(arena.size) if arena.food[cell] or arena.occupancy[cell]]
+        draw_changes()
+
+    started = time.perf_counter()
+    for _ in range(args.ticks):
+        alive = arena.step(pilot)
+        if view is not None:
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            draw_changes()
+    elapsed = time.perf_counter() - started
+
+    scores = sorted((snake.score for snake in arena.snakes), reverse=True)
+    longest = max((snake.length for snake in arena.snakes if snake.alive), default=0)
+    print(f"{args.snakes} snakes on {args.width}x{args.height}, {arena.ticks} ticks in {elapsed:.2f}s "
+          f"({arena.ticks / elapsed:.1f} ticks/s, {elapsed / arena.ticks / max(1, args.snakes) * 1e6:.1f}us per snake-tick)")
+    print(f"  alive {alive}, deaths {sum(snake.deaths for snake in arena.snakes)}, "
+          f"longest {longest}, top scores {scores[:5]}")
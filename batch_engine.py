@@ -0,0 +1,155 @@
+# batch_engine.py
+import time
+import numpy as np
+from settings import *
+
+# Action index -> direction. Reversing an action is `action ^ 1`.
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+_DX = np.array([d[0] for d in DIRECTIONS], dtype=np.int32)
+_DY = np.array([d[1] for d in DIRECTIONS], dtype=np.int32)
+
+
+class BatchEngine:
+    """
+    Many independent games stepped together with NumPy, for policy evaluation.
+    Same rules as GameEngine (Snake.move wrap-around, delayed growth, food on a free
+    cell, self collision, full board = win), but every board lives in shared arrays:
+    row i of `occupancy` is game i's segment count per cell and row i of `body` its
+    ring buffer of cells. Finished games are reset in place at the end of step().
+    """
+
+    def __init__(self, num_games, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, seed=None):
+        self.num_games = num_games
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.size = grid_width * grid_height
+        self.rng = np.random.default_rng(seed)
+        self._rows = np.arange(num_games)
+
+        self.occupancy = np.zeros((num_games, self.size), dtype=np.uint8)
+        self.body = np.zeros((num_games, self.size), dtype=np.int32) # Ring buffer, slot = seq % size
+        self.head_seq = np.zeros(num_games, dtype=np.int64)
+        self.head = np.zeros(num_games, dtype=np.int32) # Head cell, kept alongside the ring buffer
+        self.length = np.ones(num_games, dtype=np.int32)
+        self.growing = np.zeros(num_games, dtype=bool)
+        self.direction = np.zeros(num_games, dtype=np.int8) # Index into DIRECTIONS
+        self.food = np.zeros(num_games, dtype=np.int32) # Food cell, -1 when the board is full
+        self.score = np.zeros(num_games, dtype=np.int32)
+        self.steps = np.zeros(num_games, dtype=np.int64)
+
+        # Results of the games that ended on the last step, read before they were reset
+        self.final_score = np.zeros(num_games, dtype=np.int32)
+        self.final_steps = np.zeros(num_games, dtype=np.int64)
+        self.won = np.zeros(num_games, dtype=bool)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Resets the games selected by a boolean mask (all games if None), in place."""
+        rows = self._rows if mask is None else np.flatnonzero(mask)
+        if rows.size == 0:
+            return
+        start = (self.grid_height // 2) * self.grid_width + self.grid_width // 2
+        self.occupancy[rows] = 0
+        self.occupancy[rows, start] = 1
+        self.head_seq[rows] = 0
+        self.body[rows, 0] = start
+        self.head[rows] = start
+        self.length[rows] = 1
+        self.growing[rows] = False
+        self.direction[rows] = self.rng.integers(0, 4, size=rows.size)
+        self.score[rows] = 0
+        self.steps[rows] = 0
+        self._spawn_food(rows)
+
+    def _spawn_food(self, rows):
+        """Puts food on a uniformly random free cell of each listed game. Returns a 'board full' mask."""
+        keys = self.rng.random((rows.size, self.size))
+        keys[self.occupancy[rows] > 0] = -1.0
+        cells = keys.argmax(axis=1)
+        full = keys[np.arange(rows.size), cells] < 0
+        self.food[rows] = np.where(full, -1, cells)
+        return full
+
+    def step(self, actions=None):
+        """
+        Advances every game by one tick. actions holds a direction index per game
+        (-1 keeps the current direction); None keeps all directions.
+        Returns (ate_food, done) boolean arrays. Games that are done have been reset;
+        their results are in final_score, final_steps and won.
+        """
+        rows = self._rows
+        width, size = self.grid_width, self.size
+
+        # Turn, ignoring 180-degree reversals once the snake is longer than one cell
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int8)
+            turn = (actions >= 0) & ((self.length <= 1) | (actions != (self.direction ^ 1)))
+            self.direction = np.where(turn, actions, self.direction)
+
+        # New head, wrapping around the board like Snake.move
+        x = (self.head % width + _DX[self.direction]) % width
+        y = (self.head // width + _DY[self.direction]) % self.grid_height
+        new_head = (y * width + x).astype(np.int32)
+
+        # Tail advances unless the snake is growing this move
+        moving = ~self.growing
+        tail_seq = self.head_seq - self.length + 1
+        tail = self.body[rows, tail_seq % size]
+        self.occupancy[rows[moving], tail[moving]] -= 1
+        self.length += self.growing
+        self.growing[:] = False
+
+        self.head_seq += 1
+        self.body[rows, self.head_seq % size] = new_head
+        self.occupancy[rows, new_head] += 1
+        self.head = new_head
+        self.steps += 1
+
+        # Food, then collisions, in the same order as GameEngine.step
+        ate = new_head == self.food
+        done = self.occupancy[rows, new_head] > 1
+        self.won[:] = False
+        if ate.any():
+            eaters = np.flatnonzero(ate)
+            self.growing[eaters] = True
+            self.score[eaters] += 1
+            full = self._spawn_food(eaters)
+            self.won[eaters[full]] = True
+            done |= self.won
+
+        if done.any():
+            self.final_score[done] = self.score[done]
+            self.final_steps[done] = self.steps[done]
+            self.reset(done)
+        return ate, done
+
+
+# --- Throughput comparison against looping the scalar engine ---
+if __name__ == '__main__':
+    import argparse
+    import random
+    from engine import GameEngine
+
+    parser = argparse.ArgumentParser(description="Compare batched and scalar stepping with random actions.")
+    parser.add_argument('--games', type=int, default=4096)
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--width', type=int, default=GRID_WIDTH)
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT)
+    args = parser.parse_args()
+
+    batch = BatchEngine(args.games, args.width, args.height, seed=0)
+    actions = np.random.default_rng(1).integers(0, 4, size=(args.ticks, args.games))
+    started = time.perf_counter()
+    for tick in range(args.ticks):
+        batch.step(actions[tick])
+    batch_rate = args.games * args.ticks / (time.perf_counter() - started)
+
+    engines = [GameEngine(args.width, args.height) for _ in range(min(args.games, 256))]
+    started = time.perf_counter()
+    for tick in range(args.ticks):
+        for engine in engines:
+            if not engine.step(DIRECTIONS[random.randrange(4)]):
+                engine.reset()
+    scalar_rate = len(engines) * args.ticks / (time.perf_counter() - started)
+
+    print(f"batched: {batch_rate:,.0f} steps/s, scalar: {scalar_rate:,.0f} steps/s ({batch_rate / scalar_rate:.1f}x)")
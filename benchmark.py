@@ -0,0 +1,174 @@
+# benchmark.py
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from settings import *
+from game_objects import Snake, Food
+from ai import AutoPilot
+from hamiltonian import get_hamiltonian_cycle
+
+DEFAULT_SIZES = ((30, 20), (64, 64), (128, 128), (256, 256))
+DEFAULT_FILLS = (0.01, 0.10, 0.50, 0.95)
+TIMED_CALLS = ('get_next_move', 'find_path_bfs', '_can_reach_tail')
+
+
+def make_board(grid_width, grid_height, fill, rng):
+    """
+    Builds a (snake, food) board state with the snake covering `fill` of the grid.
+    The body is a stretch of the grid's Hamiltonian cycle (a plain serpentine on
+    odd x odd grids), so it is a valid snake whose tail is reachable, like in real play.
+    """
+    size = grid_width * grid_height
+    length = max(2, min(size - 1, int(size * fill)))
+    try:
+        order = list(get_hamiltonian_cycle(grid_width, grid_height).cells)
+        start = rng.randrange(size)
+        order = order[start:] + order[:start]
+    except ValueError:
+        order = [y * grid_width + (x if y % 2 == 0 else grid_width - 1 - x)
+                 for y in range(grid_height) for x in range(grid_width)]
+    cells = order[:length]
+
+    snake = Snake(grid_width, grid_height, rng)
+    head, neck = cells[-1], cells[-2]
+    snake.set_body(cells, direction=(head % grid_width - neck % grid_width, head // grid_width - neck // grid_width))
+    food = Food(grid_width, grid_height, rng)
+    food.randomize_position(snake.free_cells)
+    return snake, food
+
+
+def _calls(pilot, snake, food):
+    """The AI entry points under test, as zero-argument callables for one board state."""
+    body = snake.get_body()
+    head = snake.get_head_position()
+    obstacles = set(body[:-1])
+    # Safety check for the first free neighbor of the head, as the AI would run it
+    next_head = head
+    for dx, dy in (UP, DOWN, LEFT, RIGHT):
+        point = (head[0] + dx, head[1] + dy)
+        if pilot._is_valid(point) and not snake.occupies(point):
+            next_head = point
+            break
+    future_body = body[1:] + [next_head]
+
+    def get_next_move():
+        pilot.cached_path = None # Measure planning, not a cache hit
+        pilot.get_next_move(snake, food)
+
+    return {
+        'get_next_move': get_next_move,
+        'find_path_bfs': lambda: pilot.find_path_bfs(head, food.position, obstacles),
+        '_can_reach_tail': lambda: pilot._can_reach_tail(next_head, future_body, snake.grid_width, snake.grid_height),
+    }
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_case(grid_width, grid_height, fill, boards, repeats, seed):
+    """Times every entry point on `boards` generated states, `repeats` calls each."""
+    rng = random.Random(seed)
+    pilot = AutoPilot(grid_width, grid_height, verbose=False)
+    timings = {name: [] for name in TIMED_CALLS}
+    peaks = {name: [] for name in TIMED_CALLS}
+    for _ in range(boards):
+        snake, food = make_board(grid_width, grid_height, fill, rng)
+        for name, call in _calls(pilot, snake, food).items():
+            call() # Warm-up
+            for _ in range(repeats):
+                started = time.perf_counter_ns()
+                call()
+                timings[name].append(time.perf_counter_ns() - started)
+            # Allocation peak is measured on a separate call, tracemalloc skews timing
+            tracemalloc.start()
+            call()
+            peaks[name].append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    results = {}
+    for name in TIMED_CALLS:
+        values = sorted(timings[name])
+        results[name] = {
+            'p50_us': _percentile(values, 0.50) / 1000,
+            'p95_us': _percentile(values, 0.95) / 1000,
+            'p99_us': _percentile(values, 0.99) / 1000,
+            'alloc_peak_bytes': max(peaks[name]),
+            'samples': len(values),
+        }
+    return results
+
+
+def run_suite(sizes, fills, boards, repeats, seed=0):
+    """Runs every (grid size, fill ratio) case. Returns a list of result rows."""
+    rows = []
+    for grid_width, grid_height in sizes:
+        for fill in fills:
+            case = run_case(grid_width, grid_height, fill, boards, repeats, seed)
+            for name, stats in case.items():
+                rows.append({'grid': f"{grid_width}x{grid_height}", 'fill': fill, 'call': name, **stats})
+                print(f"{grid_width:>4}x{grid_height:<4} fill {fill:>4.0%}  {name:<16}"
+                      f" p50 {stats['p50_us']:>10.1f}us  p95 {stats['p95_us']:>10.1f}us"
+                      f"  p99 {stats['p99_us']:>10.1f}us  alloc {stats['alloc_peak_bytes']:>9,}B", flush=True)
+    return rows
+
+
+def find_regressions(rows, baseline_rows, tolerance, floor_us):
+    """
+    Compares p50/p95 against a baseline. A case regresses when it is slower than
+    baseline * tolerance and also more than floor_us slower (to ignore timer noise).
+    """
+    baseline = {(r['grid'], r['fill'], r['call']): r for r in baseline_rows}
+    regressions = []
+    for row in rows:
+        old = baseline.get((row['grid'], row['fill'], row['call']))
+        if old is None:
+            continue
+        for key in ('p50_us', 'p95_us'):
+            if row[key] > old[key] * tolerance and row[key] - old[key] > floor_us:
+                regressions.append(f"{row['grid']} fill {row['fill']:.0%} {row['call']} {key}: "
+                                   f"{old[key]:.1f}us -> {row[key]:.1f}us")
+    return regressions
+
+
+def _parse_sizes(text):
+    return tuple(tuple(int(n) for n in size.split('x')) for size in text.split(','))
+
+
+# --- Command-line runner ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Latency benchmark for the AutoPilot entry points.")
+    parser.add_argument('--sizes', type=_parse_sizes, default=DEFAULT_SIZES, help="e.g. 30x20,64x64")
+    parser.add_argument('--fills', type=lambda t: tuple(float(f) for f in t.split(',')), default=DEFAULT_FILLS,
+                        help="Snake fill ratios, e.g. 0.01,0.5,0.95")
+    parser.add_argument('--boards', type=int, default=5, help="Generated board states per case")
+    parser.add_argument('--repeats', type=int, default=20, help="Timed calls per board state")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', metavar='FILE', help="Write the results as a baseline file")
+    parser.add_argument('--compare', metavar='FILE', help="Fail if slower than this baseline")
+    parser.add_argument('--tolerance', type=float, default=1.25, help="Allowed slowdown factor against the baseline")
+    parser.add_argument('--floor-us', type=float, default=20.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    rows = run_suite(args.sizes, args.fills, args.boards, args.repeats, args.seed)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': sys.version, 'machine': platform.platform(), 'results': rows}, f, indent=1)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = find_regressions(rows, json.load(f)['results'], args.tolerance, args.floor_us)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
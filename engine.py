@@ -0,0 +1,109 @@
+# engine.py
+import time
+from settings import *
+from game_objects import Snake, Food
+
+class GameEngine:
+    """
+    Pure game rules: snake, food, collisions and scoring. Needs no pygame or display.
+    Pass rng (e.g. random.Random(seed)) to make the game reproducible.
+    """
+
+    def __init__(self, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, rng=None):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.rng = rng
+        self.snake = Snake(self.grid_width, self.grid_height, rng)
+        self.food = Food(self.grid_width, self.grid_height, rng)
+        self.reset()
+
+    def reset(self, seed=None):
+        """
+        Starts a new game on the same board.
+        A seed reseeds the engine's rng first, which must then be a random.Random.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.snake.reset()
+        self.food.randomize_position(self.snake.free_cells)
+        self.score = 0
+        self.steps = 0
+        self.game_over = False
+        self.death_cause = None # 'wall' or 'self' once the game is over
+        self.won = False # True once the snake fills the board
+        self.ate_food = False # True if the last step ate the food
+
+    def step(self, direction=None):
+        """
+        Advances the game by one tick, turning the snake first if a direction is given.
+        Returns True while the game is still running.
+        """
+        if self.game_over:
+            return False
+
+        if direction:
+            self.snake.turn(direction)
+
+        # Move the snake
+        self.snake.move()
+        self.steps += 1
+        head_pos = self.snake.get_head_position()
+
+        # Check for food collision
+        self.ate_food = head_pos == self.food.position
+        if self.ate_food:
+            self.snake.grow()
+            self.score += 1
+            # Place new food on a free cell; no free cell left means the board is full
+            if not self.food.randomize_position(self.snake.free_cells):
+                self.won = True
+                self.game_over = True
+
+        # Check for collisions (Game Over conditions)
+        # 1. Wall collision
+        hx, hy = head_pos
+        if hx < 0 or hx >= self.grid_width or hy < 0 or hy >= self.grid_height:
+            self.death_cause = 'wall'
+            self.game_over = True
+
+        # 2. Self collision
+        elif self.snake.head_collides():
+            self.death_cause = 'self'
+            self.game_over = True
+
+        return not self.game_over
+
+
+def simulate(engine, ai, max_steps):
+    """
+    Runs the engine under AI control as fast as possible (no clock, events or drawing).
+    Stops when the game ends or after max_steps ticks. Returns the number of ticks run.
+    """
+    start_steps = engine.steps
+    while not engine.game_over and engine.steps - start_steps < max_steps:
+        engine.step(ai.get_next_move(engine.snake, engine.food))
+    return engine.steps - start_steps
+
+
+# --- Headless throughput check ---
+if __name__ == '__main__':
+    import argparse
+    from ai import AutoPilot
+
+    parser = argparse.ArgumentParser(description="Run AutoPilot games headless and report throughput.")
+    parser.add_argument('--steps', type=int, default=100000, help="Total ticks to simulate")
+    parser.add_argument('--width', type=int, default=GRID_WIDTH)
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT)
+    args = parser.parse_args()
+
+    engine = GameEngine(args.width, args.height)
+    ai = AutoPilot(args.width, args.height, verbose=False)
+    total = games = 0
+    started = time.perf_counter()
+    while total < args.steps:
+        total += simulate(engine, ai, args.steps - total)
+        if engine.game_over:
+            games += 1
+            engine.reset()
+    elapsed = time.perf_counter() - started
+    print(f"{total} steps over {games} finished games in {elapsed:.2f}s ({total / elapsed:,.0f} steps/s)")
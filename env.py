@@ -0,0 +1,334 @@
+# env.py
+import random
+import numpy as np
+from multiprocessing import Pipe, Process, connection, shared_memory
+from settings import *
+from engine import GameEngine
+
+# Action index -> direction, as in BatchEngine
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+# Observation cell values
+EMPTY, BODY, HEAD, FOOD = 0, 1, 2, 3
+
+
+class SnakeEnv:
+    """
+    Gym-style wrapper around GameEngine: reset() -> observation,
+    step(action) -> (observation, reward, done, info).
+    The observation is a (grid_height, grid_width) uint8 board of EMPTY/BODY/HEAD/FOOD.
+    It is written in place into one preallocated array (pass `observation` to use your
+    own, e.g. a view into shared memory), and each step only rewrites the 3-4 cells the
+    tick changed, so the cost per step does not depend on the snake's length.
+    The returned observation is that same array, so copy it if you keep it across steps.
+    """
+
+    def __init__(self, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, seed=None,
+                 max_steps=ENV_MAX_STEPS, observation=None):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.max_steps = max_steps # Episode length cap (None for none); a capped episode reports truncated
+        self.engine = GameEngine(grid_width, grid_height, rng=random.Random(seed))
+        if observation is None:
+            observation = np.zeros((grid_height, grid_width), dtype=np.uint8)
+        elif observation.shape != (grid_height, grid_width) or observation.dtype != np.uint8:
+            raise ValueError(f"observation must be a ({grid_height}, {grid_width}) uint8 array")
+        self.observation = observation
+        self._cells = observation.reshape(-1) # Flat view, indexed by cell (a view, never a copy)
+        self._rng = random.Random(seed) # Seeds for the episodes after the first
+        self._seed = seed
+        self.reset()
+
+    def _food_cell(self):
+        position = self.engine.food.position
+        return -1 if position is None else position[1] * self.grid_width + position[0]
+
+    def reset(self):
+        """Starts a new episode and rebuilds the observation from scratch."""
+        seed, self._seed = self._seed, None
+        self.engine.reset(seed if seed is not None else self._rng.getrandbits(63))
+        snake = self.engine.snake
+        cells = self._cells
+        cells[:] = np.frombuffer(snake.occupancy, dtype=np.uint8) != 0 # BODY wherever a segment is
+        cells[snake.get_head_cell()] = HEAD
+        food = self._food_cell()
+        if food >= 0:
+            cells[food] = FOOD
+        return self.observation
+
+    def step(self, action):
+        """
+        Plays one tick; action indexes DIRECTIONS (None keeps the current direction).
+        Reward: ENV_FOOD_REWARD for eating, ENV_DEATH_REWARD for dying, ENV_STEP_REWARD otherwise.
+        """
+        engine, snake, cells = self.engine, self.engine.snake, self._cells
+        if engine.game_over:
+            raise RuntimeError("step() called on a finished episode, call reset() first")
+        head, tail, length, food = snake.get_head_cell(), snake.get_tail_cell(), snake.length, self._food_cell()
+        engine.step(None if action is None else DIRECTIONS[action])
+
+        # Only the cells this tick touched
+        if snake.length == length and tail != snake.get_head_cell():
+            cells[tail] = EMPTY # Vacated, unless the head moved straight into it
+        if snake.length > 1:
+            cells[head] = BODY
+        cells[snake.get_head_cell()] = HEAD
+        new_food = self._food_cell()
+        if new_food != food and new_food >= 0:
+            cells[new_food] = FOOD
+
+        if engine.ate_food:
+            reward = ENV_FOOD_REWARD
+        elif engine.game_over and not engine.won:
+            reward = ENV_DEATH_REWARD
+        else:
+            reward = ENV_STEP_REWARD
+        truncated = not engine.game_over and self.max_steps is not None and engine.steps >= self.max_steps
+        info = {'score': engine.score, 'steps': engine.steps, 'won': engine.won,
+                'death_cause': engine.death_cause, 'truncated': truncated}
+        return self.observation, reward, engine.game_over or truncated, info
+
+
+def _layout(num_envs, grid_width, grid_height):
+    """Offsets of the arrays in a VectorEnv's shared block: (name, dtype, shape, offset) and the total size."""
+    arrays, offset = [], 0
+    for name, dtype, shape in (('rewards', np.float32, (num_envs,)),
+                               ('scores', np.int32, (num_envs,)), # Final score of the episode that just ended
+                               ('observations', np.uint8, (num_envs, grid_height, grid_width)),
+                               ('dones', np.bool_, (num_envs,)),
+                               ('actions', np.int8, (num_envs,))):
+        arrays.append((name, dtype, shape, offset))
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+        offset = -(-offset // 8) * 8 # Keep every array 8-byte aligned
+    return arrays, offset
+
+
+def _views(buffer, num_envs, grid_width, grid_height):
+    """NumPy arrays over a shared block, laid out by _layout."""
+    arrays, _ = _layout(num_envs, grid_width, grid_height)
+    return {name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+            for name, dtype, shape, offset in arrays}
+
+
+class _EnvGroup:
+    """The environments one worker owns, stepping against the shared arrays."""
+
+    def __init__(self, views, start, stop, grid_width, grid_height, seed, max_steps):
+        self.views = views
+        self.start, self.stop = start, stop
+        # Env i is seeded with seed + i whichever worker runs it
+        self.envs = [SnakeEnv(grid_width, grid_height, seed=None if seed is None else seed + i,
+                              max_steps=max_steps, observation=views['observations'][i])
+                     for i in range(start, stop)]
+
+    def reset(self):
+        for env in self.envs:
+            env.reset()
+        self.views['rewards'][self.start:self.stop] = 0
+        self.views['dones'][self.start:self.stop] = False
+
+    def step(self):
+        """Steps every env with its action (-1 keeps the direction); finished episodes are reset in place."""
+        actions, rewards, dones, scores = (self.views[name] for name in ('actions', 'rewards', 'dones', 'scores'))
+        for i, env in enumerate(self.envs, self.start):
+            action = int(actions[i])
+            _, reward, done, info = env.step(action if action >= 0 else None)
+            rewards[i] = reward
+            dones[i] = done
+            if done:
+                scores[i] = info['score']
+                env.reset() # The observation now shows the next episode's first board
+
+
+def _worker(conn, shm_name, num_envs, start, stop, grid_width, grid_height, seed, max_steps):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        group = _EnvGroup(_views(shm.buf, num_envs, grid_width, grid_height), start, stop,
+                          grid_width, grid_height, seed, max_steps)
+        while True:
+            command = conn.recv()
+            if command == 'step':
+                group.step()
+            elif command == 'reset':
+                group.reset()
+            elif command == 'close':
+                break
+            conn.send(command) # Done; the results are in shared memory
+        del group # Release the views before closing the block
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shm.close()
+
+
+class VectorEnv:
+    """
+    num_envs SnakeEnvs stepped as one batch by `workers` processes (0 steps them in this
+    process). Observations, rewards, dones, final scores and actions live in one
+    multiprocessing.shared_memory block, exposed as the NumPy arrays `observations`
+    (num_envs, grid_height, grid_width), `rewards`, `dones`, `scores` and `actions`.
+    Workers write their results straight into it, so the learner reads them with no copy
+    and no pickling; only a short command and its acknowledgment cross the pipes.
+    step(actions) steps everything synchronously. step_async(actions, workers) starts the
+    given workers (each owns the envs in worker_slices[w]) and step_wait(workers) or
+    ready() collect them, so a learner can work on one batch while the others step.
+    Episodes that end are reset in place: dones[i] is set, scores[i] holds the final
+    score, and observations[i] already shows the next episode.
+    """
+
+    def __init__(self, num_envs, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, workers=ENV_WORKERS,
+                 seed=None, max_steps=ENV_MAX_STEPS):
+        self.num_envs = num_envs
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.num_workers = min(workers, num_envs)
+        _, size = _layout(num_envs, grid_width, grid_height)
+        self._shm = shared_memory.SharedMemory(create=True, size=size) if self.num_workers else None
+        buffer = self._shm.buf if self._shm is not None else bytearray(size)
+        views = _views(buffer, num_envs, grid_width, grid_height)
+        self.observations = views['observations']
+        self.rewards = views['rewards']
+        self.dones = views['dones']
+        self.scores = views['scores']
+        self.actions = views['actions']
+
+        # Contiguous slices of envs per worker
+        count = max(1, self.num_workers)
+        bounds = [num_envs * w // count for w in range(count + 1)]
+        self.worker_slices = [slice(bounds[w], bounds[w + 1]) for w in range(count)]
+        self._pending = set() # Workers stepping or resetting right now
+        self._conns, self._processes, self._group = [], [], None
+        if not self.num_workers:
+            self._group = _EnvGroup(views, 0, num_envs, grid_width, grid_height, seed, max_steps)
+            return
+        for w, envs in enumerate(self.worker_slices):
+            parent, child = Pipe()
+            process = Process(target=_worker, daemon=True,
+                              args=(child, self._shm.name, num_envs, envs.start, envs.stop, grid_width, grid_height,
+                                    seed, max_steps))
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(process)
+
+    def _send(self, command, workers):
+        if self._group is not None:
+            getattr(self._group, command)()
+            return
+        for w in workers:
+            if w in self._pending:
+                raise RuntimeError(f"Worker {w} is still busy, call step_wait() first")
+            self._conns[w].send(command)
+            self._pending.add(w)
+
+    def _all(self, workers):
+        return range(len(self.worker_slices)) if workers is None else workers
+
+    def reset(self):
+        """Starts new episodes in every env. Returns observations."""
+        self.step_wait()
+        self._send('reset', self._all(None))
+        self.step_wait()
+        return self.observations
+
+    def step_async(self, actions=None, workers=None):
+        """
+        Starts stepping the envs of the given workers (all if None). actions, if given,
+        is copied into `actions` first (-1 keeps an env's direction); or fill
+        `actions` directly and pass None.
+        """
+        workers = self._all(workers)
+        if actions is not None:
+            actions = np.asarray(actions)
+            for w in workers:
+                envs = self.worker_slices[w]
+                self.actions[envs] = actions[envs] if actions.shape == self.actions.shape else actions
+        self._send('step', workers)
+
+    def ready(self, timeout=None):
+        """Pending workers that have finished, waiting up to timeout seconds for at least one."""
+        if not self._pending:
+            return []
+        by_conn = {self._conns[w]: w for w in self._pending}
+        finished = [by_conn[conn] for conn in connection.wait(list(by_conn), timeout)]
+        for w in finished:
+            self._conns[w].recv()
+            self._pending.discard(w)
+        return finished
+
+    def step_wait(self, workers=None):
+        """Waits for the given workers (all pending ones if None) to finish."""
+        waiting = set(self._pending if workers is None else workers) & self._pending
+        while waiting:
+            waiting.difference_update(self.ready())
+
+    def step(self, actions=None):
+        """Steps every env once. Returns (observations, rewards, dones, scores), views into shared memory."""
+        self.step_async(actions)
+        self.step_wait()
+        return self.observations, self.rewards, self.dones, self.scores
+
+    def close(self):
+        if self._shm is None:
+            return
+        self.step_wait()
+        for conn in self._conns:
+            conn.send('close')
+        for process in self._processes:
+            process.join()
+        # The arrays point into the block; drop them so it can be closed
+        self.observations = self.rewards = self.dones = self.scores = self.actions = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- Command-line benchmark ---
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Measure environment steps per second with random actions.")
+    parser.add_argument('--envs', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=ENV_WORKERS)
+    parser.add_argument('--steps', type=int, default=2000, help="Batch steps to run")
+    parser.add_argument('--width', type=int, default=GRID_WIDTH)
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT)
+    parser.add_argument('--async-batches', action='store_true',
+                        help="Step the worker batches asynchronously, acting on each as soon as it is ready")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with VectorEnv(args.envs, args.width, args.height, workers=args.workers, seed=0) as envs:
+        envs.reset()
+        episodes = total_score = 0
+        started = time.perf_counter()
+        if args.async_batches and envs.num_workers:
+            envs.step_async(rng.integers(0, 4, size=args.envs, dtype=np.int8))
+            remaining = [args.steps - 1] * envs.num_workers
+            while envs._pending:
+                for w in envs.ready():
+                    batch = envs.worker_slices[w]
+                    done = envs.dones[batch]
+                    episodes += int(done.sum())
+                    total_score += int(envs.scores[batch][done].sum())
+                    if remaining[w]:
+                        remaining[w] -= 1
+                        envs.actions[batch] = rng.integers(0, 4, size=batch.stop - batch.start, dtype=np.int8)
+                        envs.step_async(workers=[w])
+        else:
+            for _ in range(args.steps):
+                _, _, dones, scores = envs.step(rng.integers(0, 4, size=args.envs, dtype=np.int8))
+                episodes += int(dones.sum())
+                total_score += int(scores[dones].sum())
+        elapsed = time.perf_counter() - started
+
+    steps = args.steps * args.envs
+    print(f"{args.envs} envs, {envs.num_workers} workers{' (async batches)' if args.async_batches else ''}: "
+          f"{steps} steps in {elapsed:.2f}s ({steps / elapsed:,.0f} steps/s), "
+          f"{episodes} episodes, mean score {total_score / max(1, episodes):.2f}")
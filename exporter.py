@@ -0,0 +1,165 @@
+# exporter.py
+import os
+import shutil
+import subprocess
+import sys
+import time
+import pygame
+from settings import *
+from main import Game, _window_size
+from renderer import Camera, GridRenderer, TextCache, find_font
+from replay import ReplayReader
+
+
+class ReplayExporter:
+    """
+    Renders a replay frame by frame on an off-screen surface with the game's own drawing
+    code: GridRenderer (Snake.draw, Food.draw and the dirty-cell painting) for the board
+    and Game._display_ui for the HUD. No window is opened and nothing waits on a frame
+    limiter, so frames come out as fast as they are drawn.
+    The surface is 32-bit with fixed masks, so its pixel buffer is a video frame as is.
+    """
+
+    # The HUD is the game's; it only needs the attributes set in __init__
+    _draw_text = Game._draw_text
+    _display_ui = Game._display_ui
+
+    MASKS = (0xFF0000, 0x00FF00, 0x0000FF, 0)
+
+    def __init__(self, replay, cell_size=GRID_SIZE, window_size=None, show_ui=True):
+        pygame.font.init() # Fonts only; the display is never initialized
+        self.replay = replay
+        grid_width, grid_height = replay.grid_width, replay.grid_height
+        if window_size is None:
+            window_size = (min(grid_width * cell_size, MAX_WINDOW_WIDTH), min(grid_height * cell_size, MAX_WINDOW_HEIGHT))
+        self.screen_width, self.screen_height = window_size
+        self.screen = pygame.Surface(window_size, 0, 32, self.MASKS)
+        self.camera = Camera(grid_width, grid_height,
+                             -(-self.screen_width // cell_size), -(-self.screen_height // cell_size))
+        self.renderer = GridRenderer(self.screen, grid_width, grid_height, cell_size, self.camera)
+        font_path = find_font(FONT_NAME)
+        self.font_large = pygame.font.Font(font_path, FONT_SIZE_LARGE)
+        self.font_small = pygame.font.Font(font_path, FONT_SIZE_SMALL)
+        self.text_cache = TextCache()
+        self.show_ui = show_ui
+        self.engine = None
+        # The state _display_ui shows: the recorded games are the AI's
+        self.auto_mode = True
+        self.max_speed = False
+        self.paused = False
+
+    @property
+    def score(self):
+        return self.engine.score
+
+    @property
+    def game_over(self):
+        return self.engine.game_over
+
+    @property
+    def pixel_format(self):
+        """ffmpeg's name for the surface's byte order ('bgr0' on little-endian machines)."""
+        return 'bgr0' if sys.byteorder == 'little' else '0rgb'
+
+    def frames(self, start=0, end=None, every=1):
+        """
+        Draws the frames of steps start, start + every, ... and end (default: the last step)
+        to self.screen, yielding the step number of each one once it is drawn.
+        """
+        end = self.replay.total_steps if end is None else min(end, self.replay.total_steps)
+        self.engine = self.replay.seek(start)
+        self.renderer.invalidate()
+        engine_step = self.engine.step
+        moves = self.replay.moves(start)
+        step = start
+        while True:
+            self._draw()
+            yield step
+            if step >= end:
+                return
+            count = min(every, end - step)
+            for _ in range(count):
+                engine_step(next(moves))
+            step += count
+
+    def _draw(self):
+        """The game's _draw without the display: board, UI, then the frame is closed."""
+        snake, food = self.engine.snake, self.engine.food
+        self.camera.follow(snake.get_head_position())
+        self.renderer.draw(snake, food)
+        self.renderer.restore_ui_area(snake, food)
+        if self.show_ui:
+            self._display_ui()
+        self.renderer.end_frame() # Nothing to push; the dirty rects only matter to the next frame
+
+    def write_raw(self, stream):
+        """Writes the current frame from the surface's own pixel buffer, without a copy in Python."""
+        stream.write(self.screen.get_buffer()) # The buffer is released (and the surface unlocked) right away
+
+    def save_png(self, path):
+        pygame.image.save(self.screen, path)
+
+
+def _ffmpeg(output, exporter, fps):
+    """An ffmpeg process encoding raw frames from its stdin to `output`."""
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        sys.exit("ffmpeg was not found on the PATH; use --raw to pipe the frames to an encoder yourself")
+    command = [ffmpeg, '-loglevel', 'error', '-y', '-f', 'rawvideo', '-pix_fmt', exporter.pixel_format,
+               '-s', f"{exporter.screen_width}x{exporter.screen_height}", '-r', str(fps), '-i', '-',
+               '-pix_fmt', 'yuv420p', output]
+    return subprocess.Popen(command, stdin=subprocess.PIPE)
+
+
+# --- Command-line tool ---
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export a replay to a PNG sequence or a video, without a window.")
+    parser.add_argument('file', help="Replay file (see replay.py)")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('--png', metavar='PATTERN', help="PNG per frame, e.g. frames/frame_%%06d.png (numbered by frame)")
+    output.add_argument('--raw', metavar='FILE', help="Raw frames back to back ('-' for stdout), e.g. to pipe into an encoder")
+    output.add_argument('--ffmpeg', metavar='VIDEO', help="Encode to a video file with ffmpeg, e.g. game.mp4")
+    parser.add_argument('--start', type=int, default=0, help="First step to export")
+    parser.add_argument('--end', type=int, default=None, help="Last step to export (default: the end of the game)")
+    parser.add_argument('--every', type=int, default=1, help="Export every Nth step")
+    parser.add_argument('--fps', type=int, default=30, help="Frame rate of the --ffmpeg video")
+    parser.add_argument('--cell', type=int, default=GRID_SIZE, help="Pixels per cell")
+    parser.add_argument('--window', type=_window_size, default=None, metavar='WxH',
+                        help="Frame size in pixels (default: the board, capped at MAX_WINDOW_WIDTH x MAX_WINDOW_HEIGHT)")
+    parser.add_argument('--no-ui', action='store_true', help="Leave out the score and mode text")
+    args = parser.parse_args()
+
+    exporter = ReplayExporter(ReplayReader(args.file), args.cell, args.window, show_ui=not args.no_ui)
+    encoder = None
+    if args.png:
+        directory = os.path.dirname(args.png)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        write = lambda index: exporter.save_png(args.png % index)
+    else:
+        if args.ffmpeg:
+            encoder = _ffmpeg(args.ffmpeg, exporter, args.fps)
+            stream = encoder.stdin
+        else:
+            stream = sys.stdout.buffer if args.raw == '-' else open(args.raw, 'wb')
+        write = lambda index: exporter.write_raw(stream)
+
+    report = sys.stderr if args.raw == '-' else sys.stdout # Keep stdout for the frames
+    started = time.perf_counter()
+    frames = 0
+    for step in exporter.frames(args.start, args.end, max(1, args.every)):
+        write(frames)
+        frames += 1
+    if args.png is None:
+        stream.close()
+    if encoder is not None and encoder.wait() != 0:
+        sys.exit(f"ffmpeg failed with exit code {encoder.returncode}")
+    elapsed = time.perf_counter() - started
+
+    steps = step - args.start
+    print(f"Exported {frames} frames ({exporter.screen_width}x{exporter.screen_height}, steps {args.start}-{step}) "
+          f"in {elapsed:.1f}s: {frames / elapsed:.0f} frames/s", file=report)
+    # The game speeds up as it scores, up to 30 ticks per second (see Game._update)
+    print(f"The game took at least {steps / 30:.1f}s to play ({steps / 30 / elapsed:.1f}x real time)", file=report)
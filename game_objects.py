@@ -1,32 +1,233 @@
 # game_objects.py
-import pygame
 import random
+from array import array
 from settings import *
 
+_tiles = {} # (kind, color, cell size) -> prerendered pygame.Surface
+
+
+def segment_tile(color, cell_size=GRID_SIZE):
+    """Prerendered snake segment: a filled cell with a black border."""
+    key = ('segment', color, cell_size)
+    tile = _tiles.get(key)
+    if tile is None:
+        import pygame # Imported here so the logic runs without a display
+        tile = _tiles[key] = pygame.Surface((cell_size, cell_size))
+        tile.fill(color)
+        pygame.draw.rect(tile, BLACK, tile.get_rect(), 1) # Border for clarity
+    return tile
+
+
+def food_tile(color, cell_size=GRID_SIZE):
+    """Prerendered food pellet: a filled cell with a smaller contrasting square inside."""
+    key = ('food', color, cell_size)
+    tile = _tiles.get(key)
+    if tile is None:
+        import pygame
+        tile = _tiles[key] = pygame.Surface((cell_size, cell_size))
+        tile.fill(color)
+        inner_offset = cell_size // 4
+        tile.fill(LIGHT_GREEN, tile.get_rect().inflate(-2 * inner_offset, -2 * inner_offset))
+    return tile
+
+
+class FreeCells:
+    """
+    The set of empty board cells as a swap-remove array plus a cell -> slot map.
+    Adding, removing and picking a random free cell are all O(1).
+    """
+    def __init__(self, size):
+        self.size = size
+        self.cells = array('i', range(size)) # The first `count` entries are the free cells
+        self.slots = array('i', range(size)) # Index of each cell in `cells`, or -1 if occupied
+        self.count = size
+
+    def reset(self):
+        """Marks every cell as free again."""
+        self.cells[:] = array('i', range(self.size))
+        self.slots[:] = array('i', range(self.size))
+        self.count = self.size
+
+    def copy(self):
+        """Returns an independent copy of the index."""
+        clone = FreeCells.__new__(FreeCells)
+        clone.size, clone.count = self.size, self.count
+        clone.cells = array('i', self.cells)
+        clone.slots = array('i', self.slots)
+        return clone
+
+    def order(self):
+        """The free cells in slot order, which decides what choice() picks for a given rng state."""
+        return self.cells[:self.count]
+
+    def set_order(self, cells):
+        """Makes exactly `cells` free, in this slot order (e.g. to restore a saved state)."""
+        self.slots[:] = array('i', [-1]) * self.size
+        self.count = len(cells)
+        for slot, cell in enumerate(cells):
+            self.cells[slot] = cell
+            self.slots[cell] = slot
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, cell):
+        return self.slots[cell] >= 0
+
+    def remove(self, cell):
+        """Marks a cell as occupied by swapping it past the end of the free region."""
+        slot = self.slots[cell]
+        if slot < 0:
+            return
+        self.count -= 1
+        last = self.cells[self.count]
+        self.cells[slot] = last
+        self.slots[last] = slot
+        self.cells[self.count] = cell
+        self.slots[cell] = -1
+
+    def add(self, cell):
+        """Marks a cell as free again."""
+        if self.slots[cell] >= 0:
+            return
+        self.cells[self.count] = cell
+        self.slots[cell] = self.count
+        self.count += 1
+
+    def choice(self, rng=random):
+        """Returns a uniformly random free cell, or None if the board is full."""
+        if self.count == 0:
+            return None
+        return self.cells[rng.randrange(self.count)]
+
+
 class Snake:
-    """Represents the snake."""
-    def __init__(self, grid_width, grid_height):
+    """
+    Represents the snake.
+    The body is a ring buffer of flat cell indices (y * grid_width + x) plus an
+    occupancy grid holding the number of segments on each cell, so moving,
+    growing and collision checks are all constant time.
+    rng is any random.Random-like object; the global random module is used by default.
+    """
+    def __init__(self, grid_width, grid_height, rng=None):
         self.grid_width = grid_width
         self.grid_height = grid_height
+        self.rng = rng if rng is not None else random
+        self.capacity = grid_width * grid_height # The body can never be longer than the board
+        self._cells = array('i', bytes(4 * self.capacity)) # Ring buffer, tail to head
+        self.occupancy = bytearray(self.capacity) # Segments per cell
+        self.free_cells = FreeCells(self.capacity) # Complement of the body, kept in sync by move()
         self.reset()
 
     def reset(self):
         """Resets the snake to its initial state."""
+        self.occupancy[:] = bytes(self.capacity) # Clear in place, callers may hold a reference
+        self.free_cells.reset()
         self.length = 1
+        self._head_seq = 0 # Ever-increasing write position; the buffer slot is _head_seq % capacity
         # Start position in grid coordinates
-        self.positions = [((self.grid_width // 2), (self.grid_height // 2))]
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
+        start = self.cell_index(((self.grid_width // 2), (self.grid_height // 2)))
+        self._cells[0] = start
+        self.occupancy[start] = 1
+        self.free_cells.remove(start)
+        self.direction = self.rng.choice([UP, DOWN, LEFT, RIGHT])
         self.color_head = LIGHT_GREEN
         self.color_body = GREEN
         self.growing = False # Flag to indicate if the snake should grow next move
 
+    def set_body(self, cells, direction=None, growing=False):
+        """
+        Replaces the body with the given flat cell indices (tail first, head last),
+        e.g. to restore a saved state or build a test position.
+        """
+        self.occupancy[:] = bytes(self.capacity)
+        self.free_cells.reset()
+        self.length = len(cells)
+        self._head_seq = self.length - 1
+        for seq, cell in enumerate(cells):
+            self._cells[seq] = cell
+            if not self.occupancy[cell]:
+                self.free_cells.remove(cell)
+            self.occupancy[cell] += 1
+        if direction is not None:
+            self.direction = direction
+        self.growing = growing
+
+    def copy(self):
+        """Returns an independent snapshot of the snake (the rng is shared)."""
+        clone = Snake.__new__(Snake)
+        clone.__dict__.update(self.__dict__)
+        clone._cells = array('i', self._cells)
+        clone.occupancy = bytearray(self.occupancy)
+        clone.free_cells = self.free_cells.copy()
+        return clone
+
+    def cell_index(self, point):
+        """Converts an (x, y) grid position to its flat cell index."""
+        return point[1] * self.grid_width + point[0]
+
+    def cell_position(self, cell):
+        """Converts a flat cell index back to an (x, y) grid position."""
+        return (cell % self.grid_width, cell // self.grid_width)
+
+    @property
+    def head_seq(self):
+        """
+        Move counter since the last reset. Body segments were written at sequence numbers
+        head_seq - length + 1 (tail) .. head_seq (head), see get_cell_at_seq.
+        """
+        return self._head_seq
+
+    def get_cell_at_seq(self, seq):
+        """
+        Cell written at sequence number seq. Valid for the body and for earlier moves
+        until the ring buffer wraps, i.e. while head_seq - seq < capacity.
+        """
+        return self._cells[seq % self.capacity]
+
+    def get_head_cell(self):
+        """Returns the flat cell index of the snake's head."""
+        return self._cells[self._head_seq % self.capacity]
+
+    def get_tail_cell(self):
+        """Returns the flat cell index of the snake's tail."""
+        return self._cells[(self._head_seq - self.length + 1) % self.capacity]
+
+    def get_segment_cell(self, index):
+        """Returns the flat cell index of a body segment, counting from the tail (0)."""
+        return self._cells[(self._head_seq - self.length + 1 + index) % self.capacity]
+
     def get_head_position(self):
         """Returns the position of the snake's head."""
-        return self.positions[-1]
+        return self.cell_position(self.get_head_cell())
+
+    def get_tail_position(self):
+        """Returns the position of the snake's tail."""
+        return self.cell_position(self.get_tail_cell())
+
+    def get_body_cells(self):
+        """Returns the flat cell indices of the body, tail first and head last."""
+        cells, capacity = self._cells, self.capacity
+        first = self._head_seq - self.length + 1
+        return [cells[seq % capacity] for seq in range(first, self._head_seq + 1)]
 
     def get_body(self):
-        """Returns the list of positions occupied by the snake's body."""
-        return self.positions
+        """Returns the list of positions occupied by the snake's body (tail first, head last)."""
+        width = self.grid_width
+        return [(cell % width, cell // width) for cell in self.get_body_cells()]
+
+    @property
+    def positions(self):
+        """Body positions as a list, kept for callers written against the old list storage."""
+        return self.get_body()
+
+    def occupies(self, point):
+        """Checks whether any body segment is on the given (x, y) position."""
+        return self.occupancy[self.cell_index(point)] > 0
+
+    def head_collides(self):
+        """Checks whether the head shares its cell with another body segment."""
+        return self.occupancy[self.get_head_cell()] > 1
 
     def turn(self, point):
         """Changes the snake's direction, prevents 180-degree turns."""
@@ -37,77 +238,141 @@ class Snake:
             self.direction = point
 
     def move(self):
-        """Moves the snake one step in the current direction."""
+        """
+        Moves the snake one step in the current direction.
+        Returns the position the tail vacated, or None if the snake grew.
+        """
         cur_x, cur_y = self.get_head_position()
         dx, dy = self.direction
-        new_head = (((cur_x + dx) % self.grid_width), ((cur_y + dy) % self.grid_height))
-
-        # Wall collision detection (alternative: wrap around)
-        # For this version, we let the Game class handle wall collision based on boundary check
-        # new_head = (cur_x + dx, cur_y + dy) # Use this line if you want wall collisions instead of wrap-around
-
-        # Self collision check
-        if len(self.positions) > 2 and new_head in self.positions[:-1]:
-             # Let the Game class handle self-collision game over
-             pass # Continue the move, collision check happens in Game.update
+        new_head = ((cur_x + dx) % self.grid_width) + ((cur_y + dy) % self.grid_height) * self.grid_width
 
-        self.positions.append(new_head)
+        # Self collision is left to the caller (see head_collides)
 
         # Handle growing: if growing, don't remove the tail
+        vacated = None
         if self.growing:
             self.length += 1
             self.growing = False # Reset growth flag for next move
         else:
-            # Remove the tail segment if not growing
-            self.positions.pop(0)
+            # Remove the tail segment first so the buffer never holds more than the board
+            tail = self.get_tail_cell()
+            self.occupancy[tail] -= 1
+            if not self.occupancy[tail]:
+                self.free_cells.add(tail)
+            vacated = self.cell_position(tail)
+
+        self._head_seq += 1
+        self._cells[self._head_seq % self.capacity] = new_head
+        if not self.occupancy[new_head]:
+            self.free_cells.remove(new_head)
+        self.occupancy[new_head] += 1
+        return vacated
+
+    def undo_token(self):
+        """What the next move() overwrites, to be passed to undo_move() afterwards."""
+        return (self.direction, self.growing, self._cells[(self._head_seq + 1) % self.capacity])
+
+    def undo_move(self, token):
+        """Reverts the last move() (and any turn or grow since the token was taken)."""
+        direction, growing, overwritten = token
+        slot = self._head_seq % self.capacity
+        head = self._cells[slot]
+        self.occupancy[head] -= 1
+        if not self.occupancy[head]:
+            self.free_cells.add(head)
+        self._cells[slot] = overwritten # On a full board the head was written over the old tail
+        self._head_seq -= 1
+        if growing:
+            self.length -= 1
+        else:
+            tail = self.get_tail_cell()
+            if not self.occupancy[tail]:
+                self.free_cells.remove(tail)
+            self.occupancy[tail] += 1
+        self.growing = growing
+        self.direction = direction
 
 
     def grow(self):
         """Flags the snake to grow on its next move."""
         self.growing = True
 
-    def draw(self, surface):
-        """Draws the snake on the given surface."""
-        # Draw body segments first
-        for i, p in enumerate(self.positions[:-1]): # Draw all except the head
-            r = pygame.Rect((p[0] * GRID_SIZE, p[1] * GRID_SIZE), (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(surface, self.color_body, r)
-            # Optional: add a border for clarity
-            pygame.draw.rect(surface, BLACK, r, 1)
+    def visible_cells(self, viewport):
+        """
+        Body cells inside viewport (x, y, columns, rows in cells). Walks the body or scans
+        the viewport's occupancy, whichever is shorter, so the cost is bounded by the view.
+        """
+        x0, y0, columns, rows = viewport
+        width = self.grid_width
+        if self.length <= columns * rows:
+            return [cell for cell in self.get_body_cells()
+                    if 0 <= cell % width - x0 < columns and 0 <= cell // width - y0 < rows]
+        occupancy = self.occupancy
+        cells = []
+        for y in range(y0, y0 + rows):
+            row = y * width + x0
+            for x, count in enumerate(occupancy[row:row + columns]):
+                if count:
+                    cells.append(row + x)
+        return cells
 
-        # Draw head segment last (on top)
-        head_pos = self.get_head_position()
-        head_rect = pygame.Rect((head_pos[0] * GRID_SIZE, head_pos[1] * GRID_SIZE), (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(surface, self.color_head, head_rect)
-        pygame.draw.rect(surface, BLACK, head_rect, 1) # Optional border
+    def draw(self, surface, cell_size=GRID_SIZE, viewport=None):
+        """
+        Draws the snake on the given surface as one batch of prerendered tiles.
+        With a viewport (x, y, columns, rows in cells), only segments inside it are drawn,
+        relative to its corner.
+        """
+        if viewport is None:
+            viewport = (0, 0, self.grid_width, self.grid_height)
+        x0, y0 = viewport[0], viewport[1]
+        width, size = self.grid_width, cell_size
+        head = self.get_head_cell()
+        body_tile = segment_tile(self.color_body, size)
+        tiles = [(body_tile, ((cell % width - x0) * size, (cell // width - y0) * size))
+                 for cell in self.visible_cells(viewport) if cell != head] # Body segments first
+        # Head segment last (on top)
+        if 0 <= head % width - x0 < viewport[2] and 0 <= head // width - y0 < viewport[3]:
+            tiles.append((segment_tile(self.color_head, size), ((head % width - x0) * size, (head // width - y0) * size)))
+        surface.blits(tiles, False)
 
 
 class Food:
     """Represents the food pellet."""
-    def __init__(self, grid_width, grid_height):
+    def __init__(self, grid_width, grid_height, rng=None):
         self.grid_width = grid_width
         self.grid_height = grid_height
+        self.rng = rng if rng is not None else random # Injectable for reproducible games
         self.position = (0, 0) # Initial dummy position
         self.color = RED
         self.randomize_position([]) # Initial placement requires empty snake list
 
     def randomize_position(self, snake_positions):
-        """Places the food randomly, avoiding the snake's body."""
-        while True:
-            self.position = (random.randint(0, self.grid_width - 1),
-                             random.randint(0, self.grid_height - 1))
-            # Ensure food does not spawn on the snake
-            if self.position not in snake_positions:
-                break
-
-    def draw(self, surface):
-        """Draws the food on the given surface."""
-        r = pygame.Rect((self.position[0] * GRID_SIZE, self.position[1] * GRID_SIZE), (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(surface, self.color, r)
-        # Optional: Inner smaller rect for effect
-        inner_offset = GRID_SIZE // 4
-        inner_r = pygame.Rect(
-            (self.position[0] * GRID_SIZE + inner_offset, self.position[1] * GRID_SIZE + inner_offset),
-            (GRID_SIZE - 2 * inner_offset, GRID_SIZE - 2 * inner_offset)
-        )
-        pygame.draw.rect(surface, LIGHT_GREEN, inner_r) # Use a contrasting color
\ No newline at end of file
+        """
+        Places the food randomly, avoiding the snake's body.
+        snake_positions is either the snake's FreeCells index (O(1) pick) or a list of
+        body positions. Returns False, leaving position as None, if the board is full.
+        """
+        if isinstance(snake_positions, FreeCells):
+            free_cells = snake_positions
+        else:
+            free_cells = FreeCells(self.grid_width * self.grid_height)
+            for x, y in snake_positions:
+                free_cells.remove(y * self.grid_width + x)
+
+        cell = free_cells.choice(self.rng)
+        if cell is None:
+            self.position = None # Board full: nowhere left to put food
+            return False
+        self.position = (cell % self.grid_width, cell // self.grid_width)
+        return True
+
+    def draw(self, surface, cell_size=GRID_SIZE, viewport=None):
+        """Draws the food on the given surface, relative to the viewport's corner if one is given."""
+        if self.position is None:
+            return
+        x, y = self.position
+        if viewport is not None:
+            x, y = x - viewport[0], y - viewport[1]
+            if not (0 <= x < viewport[2] and 0 <= y < viewport[3]):
+                return
+        surface.blit(food_tile(self.color, cell_size), (x * cell_size, y * cell_size))
\ No newline at end of file
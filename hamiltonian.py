@@ -0,0 +1,108 @@
+# hamiltonian.py
+from array import array
+from settings import *
+from pathfinding import get_grid_graph
+
+_cycles = {} # (width, height) -> HamiltonianCycle, built once per grid size
+
+
+class HamiltonianCycle:
+    """
+    A closed path visiting every cell of the grid exactly once.
+    cells[i] is the i-th cell on the cycle and order[cell] its position, both flat cell ids.
+    Needs at least one even side; an odd x odd grid has no Hamiltonian cycle.
+    """
+    def __init__(self, width, height):
+        if width < 2 or height < 2 or (width % 2 and height % 2):
+            raise ValueError(f"No Hamiltonian cycle on a {width}x{height} grid (needs an even side, both >= 2)")
+        self.width = width
+        self.height = height
+        self.size = width * height
+
+        if height % 2 == 0:
+            points = self._column_return_cycle(width, height)
+        else: # Build it on the transposed grid, where the rows are even
+            points = [(y, x) for x, y in self._column_return_cycle(height, width)]
+
+        self.cells = array('i', (y * width + x for x, y in points))
+        self.order = array('i', bytes(4 * self.size))
+        for i, cell in enumerate(self.cells):
+            self.order[cell] = i
+
+    @staticmethod
+    def _column_return_cycle(width, height):
+        """
+        Zig-zags through columns 1..width-1 row by row, then returns up column 0.
+        height must be even so the last row ends next to column 0.
+        """
+        points = []
+        for y in range(height):
+            xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+            points.extend((x, y) for x in xs)
+        points.extend((0, y) for y in range(height - 1, -1, -1))
+        return points
+
+
+def get_hamiltonian_cycle(width, height):
+    """Returns the shared cycle for a grid size, building it on first use."""
+    cycle = _cycles.get((width, height))
+    if cycle is None:
+        cycle = _cycles[(width, height)] = HamiltonianCycle(width, height)
+    return cycle
+
+
+class HamiltonianPilot:
+    """
+    AI that follows a fixed Hamiltonian cycle, so it can fill the whole board.
+    It takes a shortcut towards the food only when the body stays ordered along the
+    cycle (tail to head) and enough free cycle is left in front of the head.
+    Every move is O(1). The snake must already be ordered along the cycle, which
+    holds when the pilot controls it from the start of a game.
+    """
+
+    def __init__(self, grid_width, grid_height, verbose=True, time_budget=None):
+        # time_budget is accepted like for every pilot; a cycle move is O(1) and always fits
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.verbose = verbose
+        self.cycle = get_hamiltonian_cycle(grid_width, grid_height)
+        self.graph = get_grid_graph(grid_width, grid_height)
+
+    def _cycle_distance(self, from_cell, to_cell):
+        """Steps from one cell to another when following the cycle forwards."""
+        order = self.cycle.order
+        return (order[to_cell] - order[from_cell]) % self.cycle.size
+
+    def _direction_to(self, from_cell, to_cell):
+        width = self.grid_width
+        return (to_cell % width - from_cell % width, to_cell // width - from_cell // width)
+
+    def get_next_move(self, snake, food):
+        """Returns the next direction: the next cycle cell, or a safe shortcut towards the food."""
+        cycle = self.cycle
+        head = snake.get_head_cell()
+        tail = snake.get_tail_cell()
+        next_cell = cycle.cells[(cycle.order[head] + 1) % cycle.size]
+
+        # No shortcuts once the snake is long: the spare cycle is needed to absorb growth
+        future_length = snake.length + (1 if snake.growing else 0)
+        if food.position is None or future_length + HAMILTONIAN_SHORTCUT_MARGIN > cycle.size * HAMILTONIAN_SHORTCUT_MAX_FILL:
+            return self._direction_to(head, next_cell)
+
+        # Positions along the cycle measured from the tail: the body holds 0 .. head_rank
+        food_rank = self._cycle_distance(tail, food.position[1] * self.grid_width + food.position[0])
+        head_rank = self._cycle_distance(tail, head)
+        best_cell, best_rank = next_cell, self._cycle_distance(tail, next_cell)
+        occupancy = snake.occupancy
+        neighbors = self.graph.neighbors
+        for k in range(4 * head, 4 * head + 4):
+            cell = neighbors[k]
+            if cell < 0 or occupancy[cell]:
+                continue
+            rank = self._cycle_distance(tail, cell)
+            # Landing ahead of the head keeps the body ordered; not passing the food keeps
+            # the jump useful; the free cycle left must still fit the body plus a margin
+            if head_rank < rank <= food_rank and rank > best_rank \
+                    and cycle.size - rank > future_length + HAMILTONIAN_SHORTCUT_MARGIN:
+                best_cell, best_rank = cell, rank
+        return self._direction_to(head, best_cell)
@@ -0,0 +1,125 @@
+# lookahead.py
+import random
+import time
+from settings import *
+from pathfinding import PathFinder
+from snapshot import SimState
+
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT) # Same order as the neighbor table
+
+
+class LookaheadPilot:
+    """
+    Monte-Carlo lookahead: every safe first move is tried with a share of the rollout
+    budget. A rollout plays up to `depth` ticks with a cheap greedy policy on a SimState
+    snapshot and is scored by the food it eats, whether it survives, and whether the
+    tail is still reachable at the end. The move with the best mean score is played.
+    Rollouts run on one snapshot per tick and are undone with SimState.pop, so the
+    board is copied once per tick, not once per rollout.
+    """
+
+    def __init__(self, grid_width, grid_height, verbose=True, time_budget=None,
+                 rollouts=LOOKAHEAD_ROLLOUTS, depth=LOOKAHEAD_DEPTH, seed=0):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.verbose = verbose
+        self.time_budget = time_budget # Seconds per move; rollouts stop early once it is spent
+        self.rollouts = rollouts # Total rollouts per move, shared by the candidate moves
+        self.depth = depth # Ticks per rollout
+        self.rng = random.Random(seed) # Rollout choices and imagined food, separate from the game's rng
+        self.finder = PathFinder(grid_width, grid_height)
+        self.neighbors = self.finder.graph.neighbors
+        self.trapped = False
+        self.rollouts_run = 0 # Rollouts played for the last move
+
+    def _free_moves(self, snake, head):
+        """(cell, direction) pairs the head can move to without hitting the body or a wall."""
+        occupancy = snake.occupancy
+        passable = snake.get_tail_cell() if not snake.growing and snake.length > 1 else -1
+        neighbors = self.neighbors
+        moves = []
+        for k in range(4):
+            cell = neighbors[4 * head + k]
+            if cell >= 0 and (not occupancy[cell] or cell == passable):
+                moves.append((cell, DIRECTIONS[k]))
+        return moves
+
+    def _distance(self, from_cell, to_cell):
+        width = self.grid_width
+        return abs(from_cell % width - to_cell % width) + abs(from_cell // width - to_cell // width)
+
+    def _rollout(self, state):
+        """
+        Plays the greedy policy from the current state. Returns the rollout's score:
+        food eaten at tick t counts LOOKAHEAD_DISCOUNT ** t, so sooner is better.
+        """
+        rng, snake, neighbors, width = self.rng, state.snake, self.neighbors, self.grid_width
+        occupancy = snake.occupancy
+        value, weight = 0.0, 1.0
+        score = state.score
+        for _ in range(self.depth):
+            weight *= LOOKAHEAD_DISCOUNT
+            head = snake.get_head_cell()
+            passable = snake.get_tail_cell() if not snake.growing else -1
+            food = state.food_cell
+            food_x, food_y = food % width, food // width
+            explore = rng.random() < LOOKAHEAD_EXPLORATION
+            best_direction, best_key = None, None
+            for k in range(4):
+                cell = neighbors[4 * head + k]
+                if cell < 0 or (occupancy[cell] and cell != passable):
+                    continue
+                # Greedy towards the food with random tie-breaks, or fully random when exploring
+                key = rng.random() if explore else abs(cell % width - food_x) + abs(cell // width - food_y) + rng.random()
+                if best_key is None or key < best_key:
+                    best_direction, best_key = DIRECTIONS[k], key
+            if best_direction is None or not state.push(best_direction):
+                return value - weight * LOOKAHEAD_DEATH_PENALTY
+            if state.score != score:
+                value += weight
+                score = state.score
+                if state.food_cell < 0:
+                    return value # Board full
+
+        head, tail = snake.get_head_cell(), snake.get_tail_cell()
+        if snake.length > 1 and not self.finder.reachable(head, tail, occupancy, tail):
+            value -= weight * LOOKAHEAD_TRAP_PENALTY # Boxed in, likely to die soon after the horizon
+        else:
+            value -= weight * self._distance(head, state.food_cell) / (self.grid_width + self.grid_height) # Nearer is better
+        return value
+
+    def get_next_move(self, snake, food):
+        """Returns the first move whose rollouts scored best."""
+        self.trapped = False
+        self.rollouts_run = 0
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        state = SimState.from_game(snake, food, self.rng)
+        candidates = self._free_moves(state.snake, state.snake.get_head_cell())
+        if not candidates:
+            self.trapped = True
+            if self.verbose:
+                print("Lookahead: trapped, no valid moves.")
+            return snake.direction
+        if len(candidates) == 1:
+            return candidates[0][1]
+
+        totals = [0.0] * len(candidates)
+        counts = [0] * len(candidates)
+        per_move = max(1, self.rollouts // len(candidates))
+        for _ in range(per_move):
+            for i, (cell, direction) in enumerate(candidates):
+                if state.push(direction):
+                    totals[i] += state.score + self._rollout(state) # Food eaten on the first move counts in full
+                else:
+                    totals[i] -= LOOKAHEAD_DEATH_PENALTY
+                state.rewind()
+                counts[i] += 1
+                self.rollouts_run += 1
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+
+        # Best mean score; equal scores go to the move nearest the food
+        food_cell = state.food_cell
+        best = max(range(len(candidates)), key=lambda i: (round(totals[i] / counts[i], 6),
+                   -self._distance(candidates[i][0], food_cell) if food_cell >= 0 else 0))
+        return candidates[best][1]
@@ -1,98 +1,169 @@
 # main.py
+import time
+_STARTED = time.perf_counter() # For --startup-time, taken before the heavy imports
+import os
 import pygame
+import random
 import sys
 from settings import *
-from game_objects import Snake, Food
-from ai import AutoPilot
+from engine import GameEngine
+from pilots import PILOTS, create_pilot
+from planner import BackgroundPlanner
+from profiler import FrameProfiler, IdleMeter
+from replay import ReplayWriter
+from renderer import Camera, GridRenderer, TextCache, find_font
+_IMPORTED = time.perf_counter()
+
+# Video drivers on which SDL can block waiting for events (see Game._wait_for_events)
+NATIVE_WAIT_DRIVERS = ('x11', 'wayland', 'windows', 'cocoa')
 
 class Game:
     """Manages the main game loop and game state."""
 
-    def __init__(self):
-        """Initialize Pygame, screen, clock, fonts, and game objects."""
-        pygame.init()
-        pygame.mixer.init() # For potential sound effects later
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, cell_size=GRID_SIZE, window_size=None):
+        """
+        Initialize Pygame, screen, clock, fonts, and game objects.
+        The window defaults to the whole board, capped at MAX_WINDOW_WIDTH x MAX_WINDOW_HEIGHT;
+        a board that does not fit is shown through a camera following the snake's head.
+        """
+        # Only the pygame modules the game uses; pygame.init() would also open the audio device
+        pygame.display.init()
+        pygame.font.init()
+        if AUDIO_ENABLED:
+            pygame.mixer.init() # For potential sound effects later
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cell_size = cell_size
+        if window_size is None:
+            window_size = (min(grid_width * cell_size, MAX_WINDOW_WIDTH), min(grid_height * cell_size, MAX_WINDOW_HEIGHT))
+        self.screen_width, self.screen_height = window_size
+        self.screen = pygame.display.set_mode(window_size)
         pygame.display.set_caption("Advanced Snake")
         self.clock = pygame.time.Clock()
-        self.font_large = pygame.font.Font(FONT_NAME, FONT_SIZE_LARGE)
-        self.font_small = pygame.font.Font(FONT_NAME, FONT_SIZE_SMALL)
-
-        self.grid_width = GRID_WIDTH
-        self.grid_height = GRID_HEIGHT
-
-        self.snake = Snake(self.grid_width, self.grid_height)
-        self.food = Food(self.grid_width, self.grid_height)
-        self.ai = AutoPilot(self.grid_width, self.grid_height) # Initialize AI
-
-        self.score = 0
-        self.current_fps = INITIAL_FPS
-        self.game_over = False
+        font_path = find_font(FONT_NAME) # Cached on disk, see FONT_CACHE_FILE
+        self.font_large = pygame.font.Font(font_path, FONT_SIZE_LARGE)
+        self.font_small = pygame.font.Font(font_path, FONT_SIZE_SMALL)
+        self.text_cache = TextCache() # Text is only rasterized when it changes
+
+        # The engine owns the game rules; this class is only the pygame frontend
+        self.engine = GameEngine(self.grid_width, self.grid_height, rng=random.Random())
+        self.snake = self.engine.snake
+        self.food = self.engine.food
+        self.replay = None # ReplayWriter of the game being played, see REPLAY_DIR
+        self._new_game()
+        self.camera = Camera(self.grid_width, self.grid_height,
+                             -(-self.screen_width // cell_size), -(-self.screen_height // cell_size))
+        self.renderer = GridRenderer(self.screen, self.grid_width, self.grid_height, cell_size, self.camera) # Redraws only changed cells
+        self.pilot_name = AI_PILOT
+        self.ai = create_pilot(self.pilot_name, self.grid_width, self.grid_height, time_budget=AI_TIME_BUDGET) # Initialize AI
+        self.planner = BackgroundPlanner() # Plans the next AI move while the frame renders
+
+        self.current_fps = INITIAL_FPS # Simulation ticks per second; frames are drawn at RENDER_FPS
         self.running = True
         self.paused = False
         self.auto_mode = False # Start in manual mode
+        self.max_speed = False # Auto mode only: tick as fast as possible and skip rendering
+        self._tick_lag = 0.0 # Real time not yet simulated, in seconds
+        self._last_status_draw = 0.0
         self.debug_path = None # To store AI path for visualization
 
+        # Per-phase frame timing; the hooks are no-ops until toggled on (F3)
+        self.profiler = FrameProfiler(PROFILER_TRACE_FILE, trace_max_frames=PROFILER_TRACE_MAX_FRAMES)
+        if PROFILER_ENABLED:
+            self.profiler.enable()
+        self.idle_meter = None # IdleMeter when measuring idle cost (--idle-stats)
+        self._idle_screen = None # Idle state whose screen is up to date, so it is drawn once
+
+    @property
+    def score(self):
+        return self.engine.score
+
+    @property
+    def game_over(self):
+        return self.engine.game_over
 
     def _draw_text(self, text, font, color, x, y, center=True):
         """Helper function to draw text on the screen."""
-        text_surface = font.render(text, True, color)
+        text_surface = self.text_cache.render(text, font, color)
         text_rect = text_surface.get_rect()
         if center:
             text_rect.center = (x, y)
         else:
             text_rect.topleft = (x, y)
         self.screen.blit(text_surface, text_rect)
-
-    def _draw_grid(self):
-        """Draws the background grid."""
-        for x in range(0, SCREEN_WIDTH, GRID_SIZE):
-            pygame.draw.line(self.screen, DARK_GRAY, (x, 0), (x, SCREEN_HEIGHT))
-        for y in range(0, SCREEN_HEIGHT, GRID_SIZE):
-            pygame.draw.line(self.screen, DARK_GRAY, (0, y), (SCREEN_WIDTH, y))
+        return text_rect
 
     def _display_ui(self):
         """Displays the score and current mode."""
         score_text = f"Score: {self.score}"
         mode_text = "Mode: AUTO" if self.auto_mode else "Mode: MANUAL"
-        self._draw_text(score_text, self.font_small, YELLOW, 80, 15)
-        self._draw_text(mode_text, self.font_small, YELLOW, SCREEN_WIDTH - 100, 15)
+        if self.auto_mode and self.max_speed:
+            mode_text = "Mode: MAX SPEED"
+        # Every text rect is handed to the renderer so it gets pushed to the display
+        # and the cells under it are repainted before the next frame
+        ui_rect = self.renderer.add_ui_rect
+        ui_rect(self._draw_text(score_text, self.font_small, YELLOW, 80, 15))
+        ui_rect(self._draw_text(mode_text, self.font_small, YELLOW, self.screen_width - 100, 15))
 
         if self.paused and not self.game_over:
-             self._draw_text("PAUSED", self.font_large, YELLOW, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-             self._draw_text("Press P to Resume", self.font_small, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40)
+             ui_rect(self._draw_text("PAUSED", self.font_large, YELLOW, self.screen_width // 2, self.screen_height // 2))
+             ui_rect(self._draw_text("Press P to Resume", self.font_small, WHITE, self.screen_width // 2, self.screen_height // 2 + 40))
 
 
     def _show_game_over_screen(self):
-        """Displays the game over message and instructions."""
+        """Displays the game over message and instructions (R and Q go through _handle_input)."""
         self.screen.fill(BLACK) # Optional: Dim background
-        self._draw_text("GAME OVER", self.font_large, DARK_RED, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)
-        self._draw_text(f"Final Score: {self.score}", self.font_small, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-        self._draw_text("Press R to Restart", self.font_small, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40)
-        self._draw_text("Press Q to Quit", self.font_small, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 70)
+        self._draw_text("GAME OVER", self.font_large, DARK_RED, self.screen_width // 2, self.screen_height // 3)
+        self._draw_text(f"Final Score: {self.score}", self.font_small, WHITE, self.screen_width // 2, self.screen_height // 2)
+        self._draw_text("Press R to Restart", self.font_small, WHITE, self.screen_width // 2, self.screen_height // 2 + 40)
+        self._draw_text("Press Q to Quit", self.font_small, WHITE, self.screen_width // 2, self.screen_height // 2 + 70)
         pygame.display.flip()
-
-        # Wait for player input
-        waiting = True
-        while waiting:
-            self.clock.tick(15) # Low FPS while waiting
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    waiting = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_q:
-                        self.running = False
-                        waiting = False
-                    if event.key == pygame.K_r:
-                        self._reset_game()
-                        waiting = False # Exit the waiting loop to restart game loop
-
-    def _handle_input(self):
-        """Processes player input."""
-        for event in pygame.event.get():
+        self.renderer.invalidate() # The board is repainted in full once play resumes
+
+    def _idle_state(self):
+        """Why the simulation is standing still ('game over' or 'paused'), or None while it runs."""
+        if self.game_over:
+            return 'game over'
+        if self.paused:
+            return 'paused'
+        return None
+
+    def _wait_idle(self, state):
+        """
+        Draws the idle screen once, then sleeps until an input event arrives (or
+        IDLE_WAKEUP_MS passes) instead of redrawing it every frame.
+        """
+        if self._idle_screen != state:
+            if state == 'game over':
+                self._show_game_over_screen()
+            else:
+                self._draw() # The board with the PAUSED overlay
+            self._idle_screen = state
+        self._handle_input(self._wait_for_events(IDLE_WAKEUP_MS))
+
+    def _wait_for_events(self, timeout_ms):
+        """
+        Blocks until input arrives or timeout_ms passes. Returns the pending events.
+        SDL only truly sleeps on drivers that can wait for events; on the others (dummy,
+        offscreen...) pygame.event.wait polls every millisecond, so poll less often ourselves.
+        """
+        if pygame.display.get_driver() in NATIVE_WAIT_DRIVERS:
+            event = pygame.event.wait(timeout_ms)
+            return [event] + pygame.event.get() if event.type != pygame.NOEVENT else []
+        pygame.time.wait(min(timeout_ms, IDLE_POLL_MS))
+        return pygame.event.get()
+
+    def _handle_input(self, events=None):
+        """Processes player input (the pending events, unless a list is given)."""
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 self.running = False
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self._idle_screen = None # Lost its contents, draw the idle screen again
+                self.renderer.invalidate()
+            if event.type == pygame.WINDOWFOCUSLOST and not self.auto_mode and not self.game_over and not self.paused:
+                self.paused = True # Nobody is steering; sleep instead of running the snake into a wall
+                print("Paused: window lost focus.")
             if event.type == pygame.KEYDOWN:
                 if self.game_over: # Only allow R or Q on game over screen
                      if event.key == pygame.K_r:
@@ -106,7 +177,16 @@ class Game:
                     self.paused = not self.paused
                 if event.key == pygame.K_m: # Mode Toggle
                     self.auto_mode = not self.auto_mode
+                    self.planner.cancel()
                     print(f"Switched to {'Auto' if self.auto_mode else 'Manual'} mode.")
+                if event.key == pygame.K_x: # Max speed (auto mode only)
+                    self.max_speed = not self.max_speed
+                    self.renderer.invalidate()
+                    print(f"Max speed {'on' if self.max_speed else 'off'}.")
+                if event.key == pygame.K_F3: # Performance HUD and frame trace
+                    self.profiler.toggle()
+                if event.key == pygame.K_h: # Switch AI policy
+                    self._next_pilot()
                 if event.key == pygame.K_q: # Quit anytime
                     self.running = False
 
@@ -122,14 +202,37 @@ class Game:
                         self.snake.turn(RIGHT)
 
 
-    def _update(self):
-        """Updates the game state."""
+    def _next_pilot(self):
+        """Switches auto mode to the next registered AI policy."""
+        names = list(PILOTS)
+        name = names[(names.index(self.pilot_name) + 1) % len(names)]
+        try:
+            self.ai = create_pilot(name, self.grid_width, self.grid_height, time_budget=AI_TIME_BUDGET)
+        except ValueError as e:
+            print(f"Cannot use {name} pilot: {e}")
+            return
+        self.planner.cancel()
+        self.pilot_name = name
+        self.debug_path = None
+        print(f"AI pilot: {name}")
+
+    def _update(self, wait_for_ai=False):
+        """
+        Advances the game by one tick. Returns False if no tick was run: game over,
+        paused, or in auto mode the background plan is not ready yet (unless wait_for_ai).
+        """
         if self.game_over or self.paused:
-            return # Don't update if game over or paused
+            return False # Don't update if game over or paused
 
         if self.auto_mode:
-            # Get AI's next move
-            next_direction = self.ai.get_next_move(self.snake, self.food)
+            # Get the AI's next move, planned on the worker thread since the last tick
+            if not self.planner.pending:
+                self.planner.request(self.ai, self.snake, self.food, want_path=DEBUG_AI_PATH)
+            plan = self.planner.result(self.snake, wait=wait_for_ai)
+            self.profiler.mark('ai')
+            if plan is None:
+                return False # Still thinking: keep drawing and reading input meanwhile
+            next_direction, planned_path = plan
             if next_direction:
                  self.snake.turn(next_direction)
             else:
@@ -138,95 +241,218 @@ class Game:
 
             # --- Optional: Visualize AI path ---
             if DEBUG_AI_PATH:
-                 obstacles_for_debug = set(self.snake.get_body()[:-1])
-                 # Add walls
-                 for x in range(-1, self.grid_width + 1):
-                     obstacles_for_debug.add((x, -1)); obstacles_for_debug.add((x, self.grid_height))
-                 for y in range(-1, self.grid_height + 1):
-                      obstacles_for_debug.add((-1, y)); obstacles_for_debug.add((self.grid_width, y))
-                 self.debug_path = self.ai.find_path_bfs(self.snake.get_head_position(), self.food.position, obstacles_for_debug)
-
-
-        # Move the snake
-        self.snake.move()
-        head_pos = self.snake.get_head_position()
-
-        # Check for food collision
-        if head_pos == self.food.position:
-            self.snake.grow()
-            self.score += 1
+                 # The path the AI planned for this move, no extra search
+                 self.debug_path = planned_path
+
+
+        # Move the snake and apply the game rules
+        self.engine.step()
+        if self.replay is not None:
+            self.replay.record()
+            if self.game_over:
+                self._stop_recording()
+        self.profiler.mark('move')
+        if self.auto_mode and not self.game_over:
+            self.planner.request(self.ai, self.snake, self.food, want_path=DEBUG_AI_PATH) # Plan the next tick now
+
+        if self.engine.ate_food:
             self.current_fps = min(30, INITIAL_FPS + (self.score // 2)) # Speed up slightly (optional)
-            # Place new food, avoiding the *entire* current snake body
-            self.food.randomize_position(self.snake.get_body())
             self.debug_path = None # Clear debug path when food eaten
 
-        # Check for collisions (Game Over conditions)
-        # 1. Wall collision
-        hx, hy = head_pos
-        if hx < 0 or hx >= self.grid_width or hy < 0 or hy >= self.grid_height:
+        if self.engine.won:
+            print("Board full - you win!")
+        elif self.engine.death_cause == 'wall':
             print("Collision: Wall")
-            self.game_over = True
-
-        # 2. Self collision
-        # Check if head position is present anywhere else in the body list
-        if head_pos in self.snake.positions[:-1]:
-             print("Collision: Self")
-             self.game_over = True
+        elif self.engine.death_cause == 'self':
+            print("Collision: Self")
+        return True
+
+    def _advance(self, elapsed):
+        """
+        Runs the simulation ticks due after `elapsed` seconds of real time (fixed timestep).
+        In max speed mode, ticks back to back for MAX_SPEED_BATCH_SECONDS instead.
+        """
+        if self.paused:
+            self._tick_lag = 0.0
+            return
+        if self.max_speed and self.auto_mode:
+            deadline = time.perf_counter() + MAX_SPEED_BATCH_SECONDS
+            while time.perf_counter() < deadline and self._update(wait_for_ai=True):
+                pass
+            self._tick_lag = 0.0
+            return
+
+        tick_interval = 1.0 / self.current_fps
+        self._tick_lag += elapsed
+        ticks = 0
+        while self._tick_lag >= tick_interval and ticks < MAX_TICKS_PER_FRAME:
+            if not self._update():
+                break
+            self._tick_lag -= tick_interval
+            ticks += 1
+        # Whatever could not be simulated this frame (a slow plan, a long stall) is dropped
+        # rather than replayed as a burst of ticks later
+        self._tick_lag = min(self._tick_lag, tick_interval)
 
 
     def _draw(self):
-        """Draws everything to the screen."""
-        self.screen.fill(BLACK) # Background
-        self._draw_grid()      # Draw grid lines
-        self.snake.draw(self.screen)
-        self.food.draw(self.screen)
+        """Draws everything that changed since the last frame to the screen."""
+        show_debug_path = DEBUG_AI_PATH and self.auto_mode and self.debug_path
+        if show_debug_path:
+            self.renderer.invalidate() # The path outline moves every tick, repaint everything
+        self.camera.follow(self.snake.get_head_position()) # A scroll makes the renderer repaint the view
+        self.renderer.draw(self.snake, self.food) # Background, snake and food
+        self.renderer.restore_ui_area(self.snake, self.food)
 
         # Optional: Draw AI path for debugging
-        if DEBUG_AI_PATH and self.auto_mode and self.debug_path:
+        if show_debug_path:
             for point in self.debug_path:
-                r = pygame.Rect((point[0] * GRID_SIZE, point[1] * GRID_SIZE), (GRID_SIZE, GRID_SIZE))
+                r = self.renderer.point_rect(point)
                 pygame.draw.rect(self.screen, BLUE, r, 3) # Draw path outline
 
         self._display_ui()     # Draw score and mode
+        if self.profiler.enabled:
+            self._display_profiler_hud()
+        self.profiler.mark('draw')
+
+        self.renderer.present() # Update only the dirty rects (the full display after a full redraw)
+        self.profiler.mark('flip')
+
+    def _display_profiler_hud(self):
+        """Draws the per-phase timing overlay below the score."""
+        for i, line in enumerate(self.profiler.hud_lines()):
+            self.renderer.add_ui_rect(self._draw_text(line, self.font_small, WHITE, 10, 35 + i * FONT_SIZE_SMALL, center=False))
+
 
-        pygame.display.flip()  # Update the full display Surface to the screen
+    def _new_game(self):
+        """Starts the engine on a fresh seed and, if REPLAY_DIR is set, records the game."""
+        seed = random.getrandbits(63)
+        self.engine.reset(seed)
+        if REPLAY_DIR:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            path = os.path.join(REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{seed:016x}.snkr")
+            self.replay = ReplayWriter(path, self.engine, seed)
 
+    def _stop_recording(self):
+        if self.replay is not None:
+            self.replay.close()
+            self.replay = None
 
     def _reset_game(self):
         """Resets the game state for a new game."""
-        self.snake.reset()
-        self.food.randomize_position(self.snake.get_body())
-        self.score = 0
+        self.planner.cancel()
+        self._stop_recording() # A game abandoned with R is kept as it was
+        self._new_game()
+        self.renderer.invalidate()
         self.current_fps = INITIAL_FPS
-        self.game_over = False
         self.paused = False
         # self.auto_mode = False # Optional: Reset to manual mode on restart? Or keep last mode? Let's keep last mode.
         self.debug_path = None
+        self._tick_lag = 0.0
         print("Game Reset!")
 
 
+    def _should_draw(self):
+        """Max speed mode skips rendering, apart from an occasional status frame."""
+        if not (self.max_speed and self.auto_mode):
+            return True
+        now = time.perf_counter()
+        if now - self._last_status_draw < MAX_SPEED_DRAW_INTERVAL:
+            return False
+        self._last_status_draw = now
+        return True
+
     def run(self):
-        """The main game loop."""
+        """
+        The main loop. Input is read and a frame drawn every iteration at RENDER_FPS,
+        while the simulation advances by fixed ticks at current_fps (see _advance).
+        """
+        last_time = time.perf_counter()
         while self.running:
+            # Paused or game over: block on input instead of spinning at a frame rate
+            state = self._idle_state()
+            if self.idle_meter is not None:
+                self.idle_meter.mark(state)
+            if state is not None:
+                self._wait_idle(state)
+                last_time = time.perf_counter() # Idle time is not simulated
+                continue
+            self._idle_screen = None
+
+            self.profiler.begin_frame()
             self._handle_input()
+            self.profiler.mark('input')
 
-            if not self.game_over:
-                self._update()
-                self._draw()
-            else:
-                 # If game is over, handle input immediately checks for R/Q
-                 # If R is pressed, _reset_game is called, game_over becomes False
-                 # If Q is pressed, self.running becomes False
-                 # If neither, show the game over screen until R or Q
-                 self._show_game_over_screen() # Show screen and wait for R/Q
+            now = time.perf_counter()
+            elapsed, last_time = now - last_time, now
+            if not self.game_over and not self.paused: # Either may have changed with this frame's input
+                self._advance(elapsed)
+                if self._should_draw():
+                    self._draw()
 
             # Control frame rate
-            self.clock.tick(self.current_fps if not self.paused else 15) # Lower FPS when paused
+            if self.max_speed and self.auto_mode:
+                target_fps = 0 # No frame cap, the tick batches set the pace
+            elif not pygame.display.get_active():
+                target_fps = self.current_fps # Minimized: nothing to show, wake once per tick
+            else:
+                target_fps = RENDER_FPS
+            self.clock.tick(target_fps)
+            self.profiler.mark('tick')
+            self.profiler.end_frame(target_fps)
+
+        self.planner.shutdown()
+        self._stop_recording()
+        self.profiler.disable() # Flushes the trace file
+        if self.idle_meter is not None:
+            self.idle_meter.mark(None)
+            for line in self.idle_meter.report_lines():
+                print(line)
 
         pygame.quit()
         sys.exit()
 
+def _window_size(text):
+    width, _, height = text.lower().partition('x')
+    return int(width), int(height)
+
 # --- Start the game ---
 if __name__ == '__main__':
-    game = Game()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play Snake, or let the AI play it.")
+    parser.add_argument('--width', type=int, default=GRID_WIDTH, help="Board width in cells")
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT, help="Board height in cells")
+    parser.add_argument('--cell', type=int, default=GRID_SIZE, help="Pixels per cell")
+    parser.add_argument('--window', type=_window_size, default=None, metavar='WxH',
+                        help="Window size in pixels (default: the board, capped at MAX_WINDOW_WIDTH x MAX_WINDOW_HEIGHT)")
+    parser.add_argument('--idle-stats', action='store_true',
+                        help="Report wakeups and CPU time per idle minute (paused, game over) on exit")
+    parser.add_argument('--startup-time', action='store_true',
+                        help="Measure the time to the first frame and to import the AI, then quit")
+    args = parser.parse_args()
+
+    game = Game(args.width, args.height, args.cell, args.window)
+    if args.idle_stats:
+        game.idle_meter = IdleMeter()
+    if args.startup_time:
+        initialized = time.perf_counter()
+        game._draw()
+        first_frame = time.perf_counter()
+        game.planner.shutdown()
+        if game.replay is not None:
+            replay_path = game.replay._file.name
+            game._stop_recording()
+            os.remove(replay_path) # Nothing was played
+        pygame.quit()
+        # The AI in a fresh interpreter, as the tournament workers and headless tools load it
+        import subprocess
+        probe = "import sys, time; t = time.perf_counter(); import ai; print(time.perf_counter() - t, 'pygame' in sys.modules)"
+        output = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True).stdout.split()
+        print(f"Imports:     {(_IMPORTED - _STARTED) * 1000:7.1f} ms")
+        print(f"Game init:   {(initialized - _IMPORTED) * 1000:7.1f} ms")
+        print(f"First frame: {(first_frame - initialized) * 1000:7.1f} ms")
+        print(f"Total:       {(first_frame - _STARTED) * 1000:7.1f} ms")
+        print(f"AI import:   {float(output[0]) * 1000:7.1f} ms (pygame loaded: {output[1]})")
+        sys.exit()
     game.run()
\ No newline at end of file
@@ -0,0 +1,281 @@
+# pathfinding.py
+import heapq
+from array import array
+
+# Neighbor order matches the AI's direction preference: UP, DOWN, LEFT, RIGHT
+NEIGHBOR_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+_grid_graphs = {} # (width, height) -> GridGraph, built once per grid size
+
+
+class GridGraph:
+    """
+    Precomputed neighbor table for a grid of flat cell ids (y * width + x).
+    Cell c's neighbors are neighbors[4 * c] .. neighbors[4 * c + 3], with -1 off the board.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        neighbors = array('i', [-1]) * (4 * self.size)
+        for y in range(height):
+            for x in range(width):
+                base = 4 * (y * width + x)
+                for k, (dx, dy) in enumerate(NEIGHBOR_OFFSETS):
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < width and 0 <= ny < height:
+                        neighbors[base + k] = ny * width + nx
+        self.neighbors = neighbors
+
+
+def get_grid_graph(width, height):
+    """Returns the shared GridGraph for a grid size, building it on first use."""
+    graph = _grid_graphs.get((width, height))
+    if graph is None:
+        graph = _grid_graphs[(width, height)] = GridGraph(width, height)
+    return graph
+
+
+class DistanceField:
+    """
+    BFS distances and parents from one source cell, kept until the next fill.
+    Stamped like PathFinder, so refilling never clears the arrays.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.source = -1
+        self.reached = 0 # Number of cells reached, source included
+        self._stamp = array('I', bytes(4 * size))
+        self._parent = array('i', bytes(4 * size))
+        self._distance = array('i', bytes(4 * size))
+        self._generation = 0
+
+    def reaches(self, cell):
+        """Checks whether the last fill reached a cell."""
+        return self._stamp[cell] == self._generation
+
+    def distance(self, cell):
+        """Steps from the source to a cell, or -1 if it was not reached."""
+        return self._distance[cell] if self.reaches(cell) else -1
+
+    def path_to(self, cell):
+        """Cells from the source to a cell (excluding the source), or None if not reached."""
+        if not self.reaches(cell):
+            return None
+        path = []
+        parent = self._parent
+        while cell != self.source:
+            path.append(cell)
+            cell = parent[cell]
+        path.reverse()
+        return path
+
+
+class PathFinder:
+    """
+    Allocation-free BFS/A* over flat cell ids.
+    Visited marks, parents and the BFS queue are preallocated arrays reused across
+    calls; a generation stamp stands in for clearing them between searches.
+    A cell can be entered if blocked[cell] == 0 or cell == passable. The start cell
+    is never checked, so it may be blocked (it is usually the snake's head).
+    """
+    def __init__(self, width, height):
+        self.graph = get_grid_graph(width, height)
+        self.width = width
+        self.size = self.graph.size
+        self._stamp = array('I', bytes(4 * self.size)) # == _generation when visited this search
+        self._parent = array('i', bytes(4 * self.size))
+        self._cost = array('i', bytes(4 * self.size)) # A* g-scores, valid where stamped
+        self._queue = array('i', bytes(4 * self.size)) # Every cell is queued at most once
+        self._generation = 0
+        self.traversals = 0 # Graph searches run so far, for measuring the AI's per-tick work
+
+    def _next_generation(self):
+        """Starts a new search; only clears the stamps when the counter wraps."""
+        self._generation += 1
+        if self._generation > 0xFFFFFFFE:
+            self._stamp[:] = array('I', bytes(4 * self.size))
+            self._generation = 1
+        return self._generation
+
+    def _build_path(self, start, goal):
+        """Walks the parent array back from goal. Returns cells excluding start."""
+        path = []
+        parent = self._parent
+        cell = goal
+        while cell != start:
+            path.append(cell)
+            cell = parent[cell]
+        path.reverse()
+        return path
+
+    def bfs(self, start, goal, blocked, passable=-1):
+        """
+        Shortest path from start to goal with Breadth-First Search.
+        Returns a list of cells (excluding start), [] if start == goal, or None if unreachable.
+        """
+        if start == goal:
+            return []
+        if self._search(start, goal, blocked, passable, True):
+            return self._build_path(start, goal)
+        return None
+
+    def reachable(self, start, goal, blocked, passable=-1):
+        """Checks whether goal can be reached from start, without building a path."""
+        return start == goal or self._search(start, goal, blocked, passable, False)
+
+    def _search(self, start, goal, blocked, passable, record_parents):
+        self.traversals += 1
+        generation = self._next_generation()
+        stamp, parent, queue, neighbors = self._stamp, self._parent, self._queue, self.graph.neighbors
+        stamp[start] = generation
+        queue[0] = start
+        read, write = 0, 1
+        while read < write:
+            current = queue[read]
+            read += 1
+            base = 4 * current
+            for k in range(base, base + 4):
+                neighbor = neighbors[k]
+                if neighbor < 0 or stamp[neighbor] == generation:
+                    continue
+                if blocked[neighbor] and neighbor != passable:
+                    continue
+                stamp[neighbor] = generation
+                if record_parents:
+                    parent[neighbor] = current
+                if neighbor == goal:
+                    return True
+                queue[write] = neighbor
+                write += 1
+        return False
+
+    def astar(self, start, goal, blocked, passable=-1):
+        """
+        Shortest path from start to goal with A* and a Manhattan heuristic.
+        Same contract as bfs(); expands far fewer cells when the goal is far away.
+        """
+        if start == goal:
+            return []
+        self.traversals += 1
+        generation = self._next_generation()
+        stamp, parent, cost, neighbors = self._stamp, self._parent, self._cost, self.graph.neighbors
+        width, size = self.width, self.size
+        goal_x, goal_y = goal % width, goal // width
+
+        # Heap keys pack (f, -g, cell) into one int: lowest f first, deepest node on ties
+        stamp[start] = generation
+        cost[start] = 0
+        heap = [((abs(start % width - goal_x) + abs(start // width - goal_y)) * (size + 1) + size) * size + start]
+        while heap:
+            key = heapq.heappop(heap)
+            current = key % size
+            g = cost[current]
+            if size - (key // size) % (size + 1) != g:
+                continue # Stale entry, a shorter route to this cell was found
+            if current == goal:
+                return self._build_path(start, goal)
+            base = 4 * current
+            for k in range(base, base + 4):
+                neighbor = neighbors[k]
+                if neighbor < 0 or (blocked[neighbor] and neighbor != passable):
+                    continue
+                new_cost = g + 1
+                if stamp[neighbor] == generation and cost[neighbor] <= new_cost:
+                    continue
+                stamp[neighbor] = generation
+                cost[neighbor] = new_cost
+                parent[neighbor] = current
+                h = abs(neighbor % width - goal_x) + abs(neighbor // width - goal_y)
+                heapq.heappush(heap, ((new_cost + h) * (size + 1) + size - new_cost) * size + neighbor)
+        return None
+
+    def label_regions(self, seeds, blocked, passable=-1, touch=-1):
+        """
+        Labels the free regions holding the seed cells in one flood-fill pass.
+        Returns (size, touches) per seed: whether the touch cell (e.g. the tail) is in
+        the region or next to it, and the region's cell count. Seeds that share a region
+        are filled once, so the whole call visits every cell at most once. A region stops
+        growing as soon as it touches, its size is then only a lower bound; a later fill
+        that runs into such a region takes over its result.
+        """
+        self.traversals += 1
+        generation = self._next_generation()
+        stamp, label, queue, neighbors = self._stamp, self._cost, self._queue, self.graph.neighbors
+        regions = [] # (size, touches) per label
+        results = []
+        write = 0
+        for seed in seeds:
+            if stamp[seed] != generation:
+                region = len(regions)
+                regions.append(None)
+                start = write
+                stamp[seed] = generation
+                label[seed] = region
+                queue[write] = seed
+                write += 1
+                result = (1, True) if seed == touch else None
+                read = start
+                while read < write and result is None:
+                    current = queue[read]
+                    read += 1
+                    base = 4 * current
+                    for k in range(base, base + 4):
+                        neighbor = neighbors[k]
+                        if neighbor == touch:
+                            result = (write - start, True)
+                            break
+                        if neighbor < 0 or (blocked[neighbor] and neighbor != passable):
+                            continue
+                        if stamp[neighbor] == generation:
+                            if label[neighbor] != region:
+                                result = regions[label[neighbor]] # Only a region cut short can be met again
+                                break
+                            continue
+                        stamp[neighbor] = generation
+                        label[neighbor] = region
+                        queue[write] = neighbor
+                        write += 1
+                regions[region] = result or (write - start, False)
+            results.append(regions[label[seed]])
+        return results
+
+    def fill_field(self, field, start, blocked, passable=-1, goal_only=-1):
+        """
+        Fills a DistanceField with a full BFS from start.
+        goal_only is a cell that can be reached but not expanded (e.g. a tail that stays put).
+        """
+        self.traversals += 1
+        field._generation += 1
+        if field._generation > 0xFFFFFFFE:
+            field._stamp[:] = array('I', bytes(4 * field.size))
+            field._generation = 1
+        generation = field._generation
+        stamp, parent, distance = field._stamp, field._parent, field._distance
+        queue, neighbors = self._queue, self.graph.neighbors
+
+        field.source = start
+        stamp[start] = generation
+        distance[start] = 0
+        queue[0] = start
+        read, write = 0, 1
+        while read < write:
+            current = queue[read]
+            read += 1
+            if current == goal_only and current != start:
+                continue
+            next_distance = distance[current] + 1
+            base = 4 * current
+            for k in range(base, base + 4):
+                neighbor = neighbors[k]
+                if neighbor < 0 or stamp[neighbor] == generation:
+                    continue
+                if blocked[neighbor] and neighbor != passable and neighbor != goal_only:
+                    continue
+                stamp[neighbor] = generation
+                parent[neighbor] = current
+                distance[neighbor] = next_distance
+                queue[write] = neighbor
+                write += 1
+        field.reached = write
+        return field
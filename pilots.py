@@ -0,0 +1,20 @@
+# pilots.py
+from ai import AutoPilot
+from hamiltonian import HamiltonianPilot
+from lookahead import LookaheadPilot
+
+# AI policies selectable by name (in-game with the H key, or from the command-line tools).
+# Every pilot takes (grid_width, grid_height, verbose=..., time_budget=...) and has
+# get_next_move(snake, food).
+PILOTS = {
+    'autopilot': AutoPilot,
+    'hamiltonian': HamiltonianPilot,
+    'lookahead': LookaheadPilot,
+}
+
+
+def create_pilot(name, grid_width, grid_height, **options):
+    """Creates the AI policy registered under name. Raises ValueError for unknown names."""
+    if name not in PILOTS:
+        raise ValueError(f"Unknown pilot '{name}', choose from: {', '.join(PILOTS)}")
+    return PILOTS[name](grid_width, grid_height, **options)
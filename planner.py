@@ -0,0 +1,57 @@
+# planner.py
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _plan(pilot, snake, food, want_path):
+    direction = pilot.get_next_move(snake, food)
+    planned_path = getattr(pilot, 'planned_path', None)
+    return direction, planned_path() if want_path and planned_path else None
+
+
+class BackgroundPlanner:
+    """
+    Runs a pilot's get_next_move on a worker thread.
+    request() snapshots the snake and food right after a tick, so the next move is
+    planned while the frame renders and the game keeps mutating its own objects.
+    The main loop polls result() and simply skips the tick while the plan is not ready,
+    so a slow search never blocks input or drawing.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ai-planner')
+        self._future = None
+        self._seq = None # Snake head_seq the pending plan was made for
+
+    @property
+    def pending(self):
+        return self._future is not None
+
+    def request(self, pilot, snake, food, want_path=False):
+        """Starts planning the move for the snake's current state. Replaces any pending plan."""
+        self.cancel()
+        self._seq = snake.head_seq
+        self._future = self._executor.submit(_plan, pilot, snake.copy(), copy.copy(food), want_path)
+
+    def result(self, snake, wait=False):
+        """
+        Returns (direction, planned_path) once the plan is ready, else None.
+        A plan made for a different state than the snake's current one is dropped.
+        """
+        future = self._future
+        if future is None or (not wait and not future.done()):
+            return None
+        self._future = None
+        if self._seq != snake.head_seq:
+            return None
+        return future.result()
+
+    def cancel(self):
+        """Forgets the pending plan, e.g. on reset or when the pilot changes."""
+        if self._future is not None:
+            self._future.cancel() # A plan already running finishes on its own snapshot
+            self._future = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,131 @@
+# profiler.py
+import collections
+import json
+import os
+import time
+
+# Phases of one Game.run iteration, in the order they are marked
+PHASES = ('input', 'ai', 'move', 'draw', 'flip', 'tick')
+
+
+def _noop(*args):
+    pass
+
+
+class FrameProfiler:
+    """
+    Times the phases of each frame of Game.run.
+    Call begin_frame(), then mark(phase) right after each phase finishes, then
+    end_frame(target_fps). While disabled these are bound to a no-op, so the hooks
+    cost one empty call each and can stay in the loop. While enabled, every frame is
+    kept in a short history for the HUD and appended to a rolling JSONL trace.
+    """
+
+    def __init__(self, trace_path=None, history=120, trace_max_frames=10000):
+        self.trace_path = trace_path
+        self.trace_max_frames = trace_max_frames # Trace rolls over to <trace_path>.1 after this many frames
+        self.history = collections.deque(maxlen=history)
+        self.frame_count = 0
+        self._trace = None
+        self._trace_frames = 0
+        self._frame = {}
+        self._start = self._last = 0.0
+        self.enabled = False
+        self.begin_frame = self.mark = self.end_frame = _noop
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def enable(self):
+        self.enabled = True
+        self._start = self._last = time.perf_counter()
+        self.begin_frame, self.mark, self.end_frame = self._begin_frame, self._mark, self._end_frame
+
+    def disable(self):
+        self.enabled = False
+        self.begin_frame = self.mark = self.end_frame = _noop
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
+
+    def _begin_frame(self):
+        self._frame = {}
+        self._start = self._last = time.perf_counter()
+
+    def _mark(self, phase):
+        now = time.perf_counter()
+        self._frame[phase] = self._frame.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def _end_frame(self, target_fps):
+        frame = {phase: seconds * 1000 for phase, seconds in self._frame.items()}
+        frame['frame'] = (self._last - self._start) * 1000
+        frame['target'] = 1000 / target_fps if target_fps else 0.0
+        self.frame_count += 1
+        self.history.append(frame)
+        if self.trace_path:
+            self._write_trace(frame)
+
+    def _write_trace(self, frame):
+        if self._trace is None or self._trace_frames >= self.trace_max_frames:
+            if self._trace is not None:
+                self._trace.close()
+                os.replace(self.trace_path, self.trace_path + '.1')
+            self._trace = open(self.trace_path, 'a', buffering=64 * 1024)
+            self._trace_frames = 0
+        self._trace.write(json.dumps({'n': self.frame_count, 't': time.time(),
+                                      **{k: round(v, 3) for k, v in frame.items()}}) + '\n')
+        self._trace_frames += 1
+
+    def averages(self):
+        """Mean milliseconds per phase (plus 'frame' and 'target') over the recent history."""
+        if not self.history:
+            return {}
+        totals = collections.Counter()
+        for frame in self.history:
+            totals.update(frame)
+        return {key: total / len(self.history) for key, total in totals.items()}
+
+    def hud_lines(self):
+        """Text lines for the on-screen overlay."""
+        averages = self.averages()
+        if not averages:
+            return []
+        work = averages['frame'] - averages.get('tick', 0.0) # Time not spent waiting on the clock
+        lines = [f"frame {averages['frame']:.1f}ms  work {work:.1f}/{averages['target']:.1f}ms"]
+        lines.append("  ".join(f"{phase} {averages[phase]:.2f}" for phase in PHASES[:-1] if phase in averages))
+        return lines
+
+
+class IdleMeter:
+    """
+    Wakeups and CPU time of Game.run while idle (paused, game over...), per idle state.
+    Call mark(state) once per loop iteration with the current idle state, or None while
+    the game is running; the time since the previous mark is booked to the state it was in.
+    """
+
+    def __init__(self):
+        self.stats = {} # state -> [wall seconds, CPU seconds, wakeups]
+        self._state = None
+        self._last = self._last_cpu = 0.0
+
+    def mark(self, state):
+        now, cpu = time.perf_counter(), time.process_time()
+        if self._state is not None:
+            stats = self.stats.setdefault(self._state, [0.0, 0.0, 0])
+            stats[0] += now - self._last
+            stats[1] += cpu - self._last_cpu
+            if state == self._state:
+                stats[2] += 1 # Woke up and went back to sleep in the same state
+        self._state, self._last, self._last_cpu = state, now, cpu
+
+    def report_lines(self):
+        lines = []
+        for state, (seconds, cpu, wakeups) in self.stats.items():
+            minutes = max(seconds / 60.0, 1e-9)
+            lines.append(f"{state}: {seconds:.1f}s idle, {wakeups / minutes:.1f} wakeups and "
+                         f"{cpu / minutes:.3f}s CPU per idle minute")
+        return lines or ["No idle time recorded"]
@@ -0,0 +1,255 @@
+# renderer.py
+import collections
+import json
+import os
+import pygame
+from settings import *
+from game_objects import segment_tile, food_tile
+
+
+class TextCache:
+    """
+    Rendered text surfaces keyed by (text, font, color), with least-recently-used eviction.
+    UI strings such as the score only get rasterized when they change.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = collections.OrderedDict()
+
+    def render(self, text, font, color):
+        key = (text, font, color)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._surfaces[key] = font.render(text, True, color)
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(key)
+        return surface
+
+
+def find_font(name, cache_file=FONT_CACHE_FILE):
+    """
+    Path of a system font, or None for pygame's default font.
+    pygame.font.match_font scans the system font database, which can take most of a
+    second, so results are kept in cache_file; an entry whose file is gone is looked up again.
+    """
+    cache = {}
+    if cache_file:
+        try:
+            with open(cache_file) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        if name in cache and (cache[name] is None or os.path.exists(cache[name])):
+            return cache[name]
+
+    path = pygame.font.match_font(name)
+    if cache_file:
+        cache[name] = path
+        try:
+            with open(cache_file, 'w') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            print(f"Could not write font cache {cache_file}: {e}")
+    return path
+
+
+class Camera:
+    """
+    The part of the board shown in the window, in whole cells.
+    follow() scrolls only when the followed point gets within `margin` cells of the
+    view's edge, and then recenters on it, so most ticks leave the view (and the
+    renderer's dirty rects) alone.
+    """
+
+    def __init__(self, grid_width, grid_height, columns, rows, margin=CAMERA_MARGIN):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.columns = min(columns, grid_width)
+        self.rows = min(rows, grid_height)
+        self.margin = margin
+        self.x = self.y = 0 # Board cell at the view's top-left corner
+        self.scrolls = 0 # Bumped whenever the view moves
+
+    @property
+    def viewport(self):
+        """(x, y, columns, rows) of the visible cells."""
+        return (self.x, self.y, self.columns, self.rows)
+
+    def contains(self, cell_x, cell_y):
+        return 0 <= cell_x - self.x < self.columns and 0 <= cell_y - self.y < self.rows
+
+    def _axis(self, start, point, span, board):
+        margin = min(self.margin, (span - 1) // 2)
+        if point < start + margin or point > start + span - 1 - margin:
+            start = point - span // 2 # Recenter, so the next scroll is half a view away
+        return max(0, min(start, board - span))
+
+    def follow(self, point):
+        """Recenters on the (x, y) cell once it is within `margin` cells of the view's edge."""
+        x = self._axis(self.x, point[0], self.columns, self.grid_width)
+        y = self._axis(self.y, point[1], self.rows, self.grid_height)
+        if (x, y) != (self.x, self.y):
+            self.x, self.y = x, y
+            self.scrolls += 1
+
+
+class GridRenderer:
+    """
+    Draws the board with dirty rectangles.
+    The background grid is rendered once to a surface. Each frame only the cells that
+    changed since the last frame (new head cells, the old head, vacated tail cells and
+    the food) are repainted and pushed with pygame.display.update(rects). A full redraw
+    happens on the first frame and after invalidate() (reset, resize, debug overlay...).
+    Only the camera's viewport is drawn, so the cost depends on the window, not the
+    board; a scroll of the camera repaints the viewport.
+    """
+
+    def __init__(self, screen, grid_width, grid_height, cell_size=GRID_SIZE, camera=None):
+        self.screen = screen
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cell_size = cell_size
+        self.camera = camera if camera is not None else self._default_camera()
+        self._camera_scrolls = self.camera.scrolls
+        self.background = self._render_background(screen.get_size())
+        self.needs_full_redraw = True
+        self.dirty = [] # Screen rects changed this frame
+        self._full_frame = False
+        self._last_head_seq = self._last_tail_seq = 0
+        self._last_food = None
+        self._ui_rects = [] # Areas covered by UI text on the last frame
+
+    def _default_camera(self):
+        """A camera over as many cells as fit in the window."""
+        width, height = self.screen.get_size()
+        return Camera(self.grid_width, self.grid_height, -(-width // self.cell_size), -(-height // self.cell_size))
+
+    def _render_background(self, size):
+        """
+        Black surface with the grid lines, drawn once. The camera scrolls by whole cells,
+        so the same surface serves every camera position.
+        """
+        background = pygame.Surface(size, 0, self.screen) # Same pixel format as the target: plain copies
+        background.fill(BLACK)
+        # Lines only over the board, a board smaller than the window leaves a black margin
+        width = min(size[0], self.camera.columns * self.cell_size)
+        height = min(size[1], self.camera.rows * self.cell_size)
+        for x in range(0, width, self.cell_size):
+            pygame.draw.line(background, DARK_GRAY, (x, 0), (x, height))
+        for y in range(0, height, self.cell_size):
+            pygame.draw.line(background, DARK_GRAY, (0, y), (width, y))
+        return background
+
+    def invalidate(self):
+        """Forces a full redraw on the next frame."""
+        self.needs_full_redraw = True
+
+    def resize(self, screen, camera=None):
+        """Adopts a new display surface, e.g. after the window was resized."""
+        self.screen = screen
+        self.camera = camera if camera is not None else self._default_camera()
+        self._camera_scrolls = self.camera.scrolls
+        self.background = self._render_background(screen.get_size())
+        self.invalidate()
+
+    def cell_rect(self, cell):
+        """Screen rect of a board cell, for the current camera position."""
+        size = self.cell_size
+        return pygame.Rect((cell % self.grid_width - self.camera.x) * size,
+                           (cell // self.grid_width - self.camera.y) * size, size, size)
+
+    def point_rect(self, point):
+        """Screen rect of an (x, y) board position."""
+        return self.cell_rect(point[1] * self.grid_width + point[0])
+
+    def _visible(self, cell):
+        return self.camera.contains(cell % self.grid_width, cell // self.grid_width)
+
+    def draw(self, snake, food):
+        """Brings the screen up to date with the snake and food, recording the dirty rects."""
+        head_seq = snake.head_seq
+        tail_seq = head_seq - snake.length + 1
+        food_cell = None if food.position is None else food.position[1] * self.grid_width + food.position[0]
+
+        # The ring buffer still holds every vacated cell as long as it has not wrapped
+        if self.needs_full_redraw or head_seq < self._last_head_seq \
+                or head_seq - self._last_tail_seq >= snake.capacity or self.camera.scrolls != self._camera_scrolls:
+            self._draw_full(snake, food)
+        else:
+            changed = {snake.get_cell_at_seq(seq) for seq in range(self._last_tail_seq, tail_seq)}
+            changed.update(snake.get_cell_at_seq(seq) for seq in range(self._last_head_seq, head_seq + 1))
+            if food_cell != self._last_food:
+                changed.add(food_cell)
+                changed.add(self._last_food)
+            changed.discard(None)
+            self._paint_cells([cell for cell in changed if self._visible(cell)], snake, food)
+
+        self._last_head_seq, self._last_tail_seq, self._last_food = head_seq, tail_seq, food_cell
+
+    def _draw_full(self, snake, food):
+        self.screen.blit(self.background, (0, 0))
+        viewport = self.camera.viewport
+        snake.draw(self.screen, self.cell_size, viewport) # Culled to the viewport
+        food.draw(self.screen, self.cell_size, viewport)
+        self._camera_scrolls = self.camera.scrolls
+        self.needs_full_redraw = False
+        self._full_frame = True
+        self._ui_rects = []
+
+    def _paint_cells(self, cells, snake, food):
+        """Repaints cells from the current game state with one batched blit."""
+        food_cell = None if food.position is None else food.position[1] * self.grid_width + food.position[0]
+        head = snake.get_head_cell()
+        occupancy = snake.occupancy
+        head_tile = segment_tile(snake.color_head, self.cell_size)
+        body_tile = segment_tile(snake.color_body, self.cell_size)
+        background = self.background
+        blits = []
+        for cell in cells:
+            rect = self.cell_rect(cell)
+            if cell == head:
+                blits.append((head_tile, rect))
+            elif occupancy[cell]:
+                blits.append((body_tile, rect))
+            elif cell == food_cell:
+                blits.append((food_tile(food.color, self.cell_size), rect))
+            else:
+                blits.append((background, rect, rect))
+            self.dirty.append(rect)
+        self.screen.blits(blits, False)
+
+    def restore_ui_area(self, snake, food):
+        """Repaints the cells under last frame's UI text so it can be drawn again."""
+        if self._full_frame:
+            return
+        size, camera = self.cell_size, self.camera
+        cells = set()
+        for rect in self._ui_rects:
+            for y in range(max(0, rect.top // size), min(camera.rows, (rect.bottom - 1) // size + 1)):
+                for x in range(max(0, rect.left // size), min(camera.columns, (rect.right - 1) // size + 1)):
+                    cells.add((y + camera.y) * self.grid_width + x + camera.x)
+        self._paint_cells(cells, snake, food)
+        self._ui_rects = []
+
+    def add_ui_rect(self, rect):
+        """Records an area covered by UI text this frame."""
+        self._ui_rects.append(rect)
+        self.dirty.append(rect)
+
+    def end_frame(self):
+        """Closes the frame: the rects to push, or None after a full redraw."""
+        dirty = None if self._full_frame else self.dirty
+        self.dirty = []
+        self._full_frame = False
+        return dirty
+
+    def present(self):
+        """Pushes this frame to the display: the dirty rects, or everything after a full redraw."""
+        dirty = self.end_frame()
+        if dirty is None:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
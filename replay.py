@@ -0,0 +1,315 @@
+# replay.py
+import bisect
+import random
+import struct
+from array import array
+from settings import *
+from engine import GameEngine
+
+# File layout (little-endian): a header, then records of tag (1 byte) + payload size (u32) + payload.
+#   'M' move chunk: move count (u32), then the moves packed 2 bits each, first move in the low bits
+#   'K' keyframe:   full game state after `step` moves (see _encode_keyframe)
+#   'E' end:        final steps, score and outcome; missing if the recording was cut short
+# The snake's moves are enough to replay a game from any keyframe, since keyframes hold
+# the RNG state the food placement depends on.
+MAGIC = b'SNKR'
+VERSION = 1
+_HEADER = struct.Struct('<4sHHHIq') # magic, version, width, height, keyframe interval, seed
+_RECORD = struct.Struct('<cI')
+_KEYFRAME = struct.Struct('<QIIIBBi') # step, score, length, tail cell, direction, growing, food cell (-1 none)
+_END = struct.Struct('<QIBB') # steps, score, won, death cause
+
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT) # Index is the 2-bit move code
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+DEATH_CAUSES = (None, 'wall', 'self')
+# Byte -> the four moves packed in it, so decoding is one lookup per four steps
+_UNPACKED = [tuple(DIRECTIONS[(byte >> shift) & 3] for shift in (0, 2, 4, 6)) for byte in range(256)]
+
+
+def _pack_codes(codes):
+    """Packs a sequence of 2-bit codes, four per byte."""
+    packed = bytearray((len(codes) + 3) // 4)
+    for i, code in enumerate(codes):
+        packed[i >> 2] |= code << ((i & 3) * 2)
+    return packed
+
+
+def _step_code(grid_width, grid_height, from_cell, to_cell):
+    """Move code for one step between adjacent cells, wrapping around the board edges."""
+    dx = (to_cell % grid_width - from_cell % grid_width) % grid_width
+    if dx:
+        return DIRECTION_CODES[RIGHT] if dx == 1 else DIRECTION_CODES[LEFT]
+    dy = (to_cell // grid_width - from_cell // grid_width) % grid_height
+    return DIRECTION_CODES[DOWN] if dy == 1 else DIRECTION_CODES[UP]
+
+
+def _cell_typecode(size):
+    return 'H' if size <= 0x10000 else 'I'
+
+
+def _encode_keyframe(engine):
+    """
+    Snapshot of the engine: counters, food, the body as its tail cell plus one 2-bit step
+    per segment, and what the next food placements depend on: the RNG state and the slot
+    order of the free cells.
+    """
+    snake, food = engine.snake, engine.food
+    width, height = snake.grid_width, snake.grid_height
+    body = snake.get_body_cells()
+    food_cell = -1 if food.position is None else food.position[1] * width + food.position[0]
+    header = _KEYFRAME.pack(engine.steps, engine.score, snake.length, body[0],
+                            DIRECTION_CODES[snake.direction], snake.growing, food_cell)
+    segments = _pack_codes([_step_code(width, height, body[i - 1], body[i]) for i in range(1, len(body))])
+
+    version, internal, gauss_next = engine.rng.getstate() # The engine must use a random.Random
+    rng_state = struct.pack('<BBd', version, gauss_next is not None, gauss_next or 0.0) + array('I', internal).tobytes()
+    free_cells = array(_cell_typecode(snake.capacity), snake.free_cells.order()).tobytes()
+    return header + struct.pack('<II', len(segments), len(free_cells)) + segments + free_cells + rng_state
+
+
+def _decode_keyframe(payload, grid_width, grid_height):
+    """Inverse of _encode_keyframe, returning a dict of the state."""
+    step, score, length, tail, direction, growing, food_cell = _KEYFRAME.unpack_from(payload)
+    offset = _KEYFRAME.size
+    segments_size, free_cells_size = struct.unpack_from('<II', payload, offset)
+    offset += 8
+    segments = payload[offset:offset + segments_size]
+    offset += segments_size
+    free_cells = array(_cell_typecode(grid_width * grid_height))
+    free_cells.frombytes(payload[offset:offset + free_cells_size])
+    offset += free_cells_size
+
+    cells = [tail]
+    x, y = tail % grid_width, tail // grid_width
+    for i in range(length - 1):
+        dx, dy = DIRECTIONS[(segments[i >> 2] >> ((i & 3) * 2)) & 3]
+        x, y = (x + dx) % grid_width, (y + dy) % grid_height
+        cells.append(y * grid_width + x)
+
+    version, has_gauss, gauss_next = struct.unpack_from('<BBd', payload, offset)
+    internal = array('I')
+    internal.frombytes(payload[offset + 10:])
+    return {
+        'step': step,
+        'score': score,
+        'cells': cells,
+        'direction': DIRECTIONS[direction],
+        'growing': bool(growing),
+        'food': None if food_cell < 0 else (food_cell % grid_width, food_cell // grid_width),
+        'free_cells': free_cells,
+        'rng_state': (version, tuple(internal), gauss_next if has_gauss else None),
+    }
+
+
+class ReplayWriter:
+    """
+    Streams one game to a replay file while it is played.
+    Call record() after every engine.step(). Moves are packed as they come and written
+    in chunks of chunk_moves; every keyframe_interval steps a keyframe is written too.
+    The engine's rng must be a random.Random, reseeded with `seed` by the caller
+    (see GameEngine.reset), so the file can name the game it holds.
+    """
+
+    def __init__(self, path, engine, seed, keyframe_interval=REPLAY_KEYFRAME_INTERVAL,
+                 chunk_moves=REPLAY_CHUNK_MOVES):
+        self.engine = engine
+        self.keyframe_interval = keyframe_interval - keyframe_interval % 4 or 4 # Keyframes start on a whole byte
+        self.chunk_moves = chunk_moves - chunk_moves % 4 or 4
+        self._file = open(path, 'wb', buffering=64 * 1024)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, engine.grid_width, engine.grid_height,
+                                      self.keyframe_interval, seed))
+        self._moves = bytearray() # Packed moves not written yet
+        self._count = 0 # Moves in _moves
+        self._byte = self._shift = 0 # Byte being packed, and the bit position of the next move
+        self._write_record(b'K', _encode_keyframe(engine))
+
+    def _write_record(self, tag, payload):
+        self._file.write(_RECORD.pack(tag, len(payload)))
+        self._file.write(payload)
+
+    def record(self, direction=None):
+        """Adds the move the engine just made (the snake's direction unless given)."""
+        self._byte |= DIRECTION_CODES[direction or self.engine.snake.direction] << self._shift
+        self._shift += 2
+        if self._shift == 8:
+            self._moves.append(self._byte)
+            self._byte = self._shift = 0
+        self._count += 1
+
+        if self._count >= self.chunk_moves:
+            self._flush_moves()
+        engine = self.engine
+        if engine.steps % self.keyframe_interval == 0 and not engine.game_over:
+            self._flush_moves() # A keyframe always starts a new chunk, so seeking never splits a byte
+            self._write_record(b'K', _encode_keyframe(engine))
+
+    def _flush_moves(self):
+        if not self._count:
+            return
+        if self._shift:
+            self._moves.append(self._byte)
+        self._write_record(b'M', struct.pack('<I', self._count) + self._moves)
+        self._moves = bytearray()
+        self._count = self._byte = self._shift = 0
+
+    def close(self):
+        """Writes the pending moves and the end record."""
+        if self._file is None:
+            return
+        self._flush_moves()
+        engine = self.engine
+        self._write_record(b'E', _END.pack(engine.steps, engine.score, engine.won,
+                                           DEATH_CAUSES.index(engine.death_cause)))
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayReader:
+    """
+    Reads a replay file. Opening it only scans the record headers to index the keyframes
+    and move chunks; seek(step) restores the nearest keyframe at or before step and
+    replays the moves from there.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._data = f.read()
+        magic, version, self.grid_width, self.grid_height, self.keyframe_interval, self.seed = \
+            _HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} snake replay")
+
+        self._keyframe_steps = [] # Sorted step numbers of the keyframes
+        self._keyframes = [] # (payload offset, payload size)
+        self._chunk_steps = [] # First step of each move chunk
+        self._chunks = [] # (payload offset, move count)
+        self.total_steps = 0
+        self.result = None # Final steps, score, won and death cause, if the game was closed properly
+
+        offset = _HEADER.size
+        while offset + _RECORD.size <= len(self._data):
+            tag, size = _RECORD.unpack_from(self._data, offset)
+            offset += _RECORD.size
+            if offset + size > len(self._data):
+                break # Recording cut short in the middle of a record
+            if tag == b'M':
+                (count,) = struct.unpack_from('<I', self._data, offset)
+                self._chunk_steps.append(self.total_steps)
+                self._chunks.append((offset + 4, count))
+                self.total_steps += count
+            elif tag == b'K':
+                (step,) = struct.unpack_from('<Q', self._data, offset)
+                self._keyframe_steps.append(step)
+                self._keyframes.append((offset, size))
+            elif tag == b'E':
+                steps, score, won, cause = _END.unpack_from(self._data, offset)
+                self.result = {'steps': steps, 'score': score, 'won': bool(won), 'death_cause': DEATH_CAUSES[cause]}
+            offset += size
+
+    @property
+    def keyframe_steps(self):
+        return list(self._keyframe_steps)
+
+    def moves(self, start=0):
+        """Yields the recorded directions from step `start` on."""
+        if not self._chunks:
+            return
+        index = max(0, bisect.bisect_right(self._chunk_steps, start) - 1)
+        skip = start - self._chunk_steps[index]
+        data, unpacked = self._data, _UNPACKED
+        for offset, count in self._chunks[index:]:
+            moves = [direction for byte in data[offset:offset + (count + 3) // 4] for direction in unpacked[byte]]
+            yield from moves[skip:count]
+            skip = 0
+
+    def _restore(self, engine, keyframe):
+        snake = engine.snake
+        snake.set_body(keyframe['cells'], keyframe['direction'], keyframe['growing'])
+        snake.free_cells.set_order(keyframe['free_cells'])
+        engine.food.position = keyframe['food']
+        engine.rng.setstate(keyframe['rng_state'])
+        engine.score = keyframe['score']
+        engine.steps = keyframe['step']
+        engine.game_over = engine.won = engine.ate_food = False
+        engine.death_cause = None
+
+    def seek(self, step, engine=None):
+        """
+        Returns a GameEngine (a new one unless given) in the state after `step` moves,
+        restored from the nearest keyframe and replayed from there.
+        """
+        if not 0 <= step <= self.total_steps:
+            raise ValueError(f"step {step} is outside the replay (0-{self.total_steps})")
+        return self._replay(bisect.bisect_right(self._keyframe_steps, step) - 1, step, engine)
+
+    def play(self, engine=None):
+        """Replays the whole game headless from the first keyframe. Returns the engine in its final state."""
+        return self._replay(0, self.total_steps, engine)
+
+    def _replay(self, keyframe_index, step, engine):
+        """Restores a keyframe and replays the moves up to `step`."""
+        if engine is None:
+            engine = GameEngine(self.grid_width, self.grid_height, rng=random.Random(self.seed))
+        offset, size = self._keyframes[keyframe_index]
+        self._restore(engine, _decode_keyframe(self._data[offset:offset + size], self.grid_width, self.grid_height))
+        remaining = step - engine.steps
+        if remaining:
+            engine_step = engine.step
+            for direction in self.moves(engine.steps):
+                engine_step(direction)
+                remaining -= 1
+                if not remaining:
+                    break
+        return engine
+
+
+# --- Command-line tool ---
+if __name__ == '__main__':
+    import argparse
+    import os
+    import time
+    from pilots import PILOTS, create_pilot
+
+    parser = argparse.ArgumentParser(description="Record an AI game to a replay file, or inspect and replay one.")
+    parser.add_argument('file')
+    parser.add_argument('--record', action='store_true', help="Play a headless game and record it to FILE")
+    parser.add_argument('--pilot', choices=list(PILOTS), default=AI_PILOT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--width', type=int, default=GRID_WIDTH)
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT)
+    parser.add_argument('--max-steps', type=int, default=1000000)
+    parser.add_argument('--seek', type=int, default=None, help="Print the state after this many steps")
+    args = parser.parse_args()
+
+    if args.record:
+        engine = GameEngine(args.width, args.height, rng=random.Random())
+        engine.reset(seed=args.seed)
+        pilot = create_pilot(args.pilot, args.width, args.height, verbose=False)
+        with ReplayWriter(args.file, engine, args.seed) as writer:
+            while not engine.game_over and engine.steps < args.max_steps:
+                engine.step(pilot.get_next_move(engine.snake, engine.food))
+                writer.record()
+        print(f"Recorded {engine.steps} steps (score {engine.score}) to {args.file}")
+
+    replay = ReplayReader(args.file)
+    if args.seek is not None and not 0 <= args.seek <= replay.total_steps:
+        parser.error(f"--seek must be between 0 and {replay.total_steps}")
+    print(f"{args.file}: {replay.grid_width}x{replay.grid_height}, seed {replay.seed}, {replay.total_steps} steps, "
+          f"{len(replay.keyframe_steps)} keyframes, {os.path.getsize(args.file):,} bytes")
+    started = time.perf_counter()
+    engine = replay.play()
+    elapsed = time.perf_counter() - started
+    print(f"Replayed in {elapsed:.2f}s ({engine.steps / elapsed if elapsed else 0:,.0f} steps/s), final score {engine.score}")
+    if replay.result is not None and (replay.result['score'], replay.result['steps']) != (engine.score, engine.steps):
+        print(f"MISMATCH: the recording ended with score {replay.result['score']} after {replay.result['steps']} steps")
+        raise SystemExit(1)
+    if args.seek is not None:
+        engine = replay.seek(args.seek)
+        print(f"Step {engine.steps}: score {engine.score}, length {engine.snake.length}, "
+              f"head {engine.snake.get_head_position()}, food {engine.food.position}")
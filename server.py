@@ -0,0 +1,336 @@
+# server.py
+import asyncio
+import collections
+import random
+import socket
+import struct
+import time
+from array import array
+from settings import *
+from engine import GameEngine
+from pilots import create_pilot
+
+# Wire format (little-endian). Server -> client messages start with a tag byte:
+#   'S' snapshot: full state, sent on join, after a resync and when a new game starts
+#   'D' delta:    one tick: new head cell, vacated tail cell (-1 if the snake grew),
+#                 new food cell (-1 if the food did not move)
+#   'O' over:     the game ended; a snapshot of the next game follows
+# Every message carries the server's tick. A client that falls behind misses messages
+# until a snapshot resyncs it; deltas not newer than the last snapshot can be skipped.
+# Client -> server: single bytes, b'U'/b'D'/b'L'/b'R' to steer (the first client to steer
+# takes control from the AI until it disconnects) and b'A' to hand control back.
+# Cells are flat indexes, y * width + x.
+_SNAPSHOT = struct.Struct('<cIHHIiI') # tag, tick, width, height, score, food cell (-1 none), length; then the body cells, tail first
+_DELTA = struct.Struct('<cIiii') # tag, tick, head cell, vacated cell, food cell
+_OVER = struct.Struct('<cIIc') # tag, tick, score, cause (b'w' wall, b's' self, b'f' board full)
+_CAUSES = {'wall': b'w', 'self': b's', None: b'f'}
+_COMMANDS = {b'U': UP, b'D': DOWN, b'L': LEFT, b'R': RIGHT}
+class _Spectator:
+    """One connection. Its transport's write buffer is the client's outgoing queue."""
+    __slots__ = ('writer', 'transport', 'behind', 'resyncs')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.transport = writer.transport
+        self.behind = False # Dropping messages until the buffer drains, then resynced
+        self.resyncs = 0
+
+
+class SpectatorServer:
+    """
+    Runs one game under asyncio and streams it to every connected client.
+    Each tick is encoded once and the same bytes are written to every client's transport
+    straight from the tick, with no task or queue per client: the transport's write
+    buffer is the client's queue, bounded at queue_size bytes. A client whose buffer is
+    full misses messages until it has drained, then gets a fresh snapshot (a resync), so
+    a slow reader never holds back the tick and memory per client stays bounded.
+    """
+
+    def __init__(self, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, tick_rate=SERVER_TICK_RATE,
+                 pilot=AI_PILOT, queue_size=SERVER_WRITE_BUFFER, seed=None):
+        self.engine = GameEngine(grid_width, grid_height, rng=random.Random(seed))
+        self.pilot = create_pilot(pilot, grid_width, grid_height, verbose=False)
+        self.tick_rate = tick_rate
+        self.queue_size = queue_size # Bytes buffered per client before it counts as behind
+        self.clients = {} # writer -> _Spectator
+        self._behind = set() # Clients waiting for a resync
+        self.controller = None # Writer of the client steering the snake, None for the AI
+        self._remote_direction = None
+        self.tick = 0 # Ticks since the server started, over all games
+        self.games = 0
+        self.bytes_sent = 0
+        self.resyncs = 0
+        self.step_seconds = 0.0 # Time spent in step(), the AI move plus the broadcast
+        self._server = None
+        self._ticker = None
+
+    # --- Encoding ---
+    def _food_cell(self):
+        position = self.engine.food.position
+        return -1 if position is None else position[1] * self.engine.grid_width + position[0]
+
+    def snapshot(self):
+        """The full game state as one message."""
+        snake = self.engine.snake
+        cells = array('i', snake.get_body_cells())
+        return _SNAPSHOT.pack(b'S', self.tick, self.engine.grid_width, self.engine.grid_height,
+                              self.engine.score, self._food_cell(), len(cells)) + cells.tobytes()
+
+    # --- Broadcasting ---
+    def broadcast(self, message):
+        limit, sent = self.queue_size, 0
+        for client in self.clients.values():
+            if client.behind:
+                continue
+            transport = client.transport
+            if transport.get_write_buffer_size() > limit:
+                client.behind = True # Its backlog is left to drain, newer messages are dropped
+                client.resyncs += 1
+                self.resyncs += 1
+                self._behind.add(client)
+                continue
+            transport.write(message)
+            sent += len(message)
+        self.bytes_sent += sent
+
+    def _resync(self):
+        """Sends a snapshot to every client that was behind and has drained its buffer."""
+        snapshot = None
+        for client in [client for client in self._behind if not client.transport.get_write_buffer_size()]:
+            if snapshot is None:
+                snapshot = self.snapshot()
+            client.transport.write(snapshot)
+            self.bytes_sent += len(snapshot)
+            client.behind = False
+            self._behind.discard(client)
+
+    # --- Connections ---
+    async def _handle_client(self, reader, writer):
+        client = _Spectator(writer)
+        sock = writer.get_extra_info('socket')
+        if sock is not None and SERVER_SOCKET_BUFFER:
+            # Left alone the kernel grows it to megabytes per client
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SERVER_SOCKET_BUFFER)
+        self.clients[writer] = client
+        snapshot = self.snapshot()
+        writer.write(snapshot)
+        self.bytes_sent += len(snapshot)
+        try:
+            while True:
+                command = await reader.read(64)
+                if not command:
+                    break
+                for byte in command:
+                    self._command(writer, bytes((byte,)))
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            if self.controller is writer:
+                self.controller = None # Back to the AI
+            del self.clients[writer]
+            self._behind.discard(client)
+            writer.close()
+
+    def _command(self, writer, command):
+        if command in _COMMANDS:
+            if self.controller is None:
+                self.controller = writer
+            if self.controller is writer:
+                self._remote_direction = _COMMANDS[command]
+        elif command == b'A' and self.controller is writer:
+            self.controller = None
+
+    # --- Game loop ---
+    def step(self):
+        """Plays one tick and broadcasts its delta (and the next game's snapshot after a game over)."""
+        engine, snake = self.engine, self.engine.snake
+        if self.controller is None:
+            direction = self.pilot.get_next_move(snake, engine.food)
+        else:
+            direction, self._remote_direction = self._remote_direction, None
+
+        if self._behind:
+            self._resync()
+        tail, length, food = snake.get_tail_cell(), snake.length, self._food_cell()
+        engine.step(direction)
+        self.tick += 1
+        new_food = self._food_cell()
+        self.broadcast(_DELTA.pack(b'D', self.tick, snake.get_head_cell(),
+                                   tail if snake.length == length else -1, new_food if new_food != food else -1))
+        if engine.game_over:
+            self.broadcast(_OVER.pack(b'O', self.tick, engine.score, _CAUSES[engine.death_cause]))
+            self.games += 1
+            engine.reset()
+            self.broadcast(self.snapshot())
+
+    async def _tick_loop(self):
+        """Fixed-rate ticks; a late tick shortens the next wait instead of adding up."""
+        interval = 1.0 / self.tick_rate
+        next_tick = time.perf_counter()
+        while True:
+            started = time.perf_counter()
+            self.step()
+            self.step_seconds += time.perf_counter() - started
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay < -interval:
+                next_tick = time.perf_counter() # Too far behind, drop the missed ticks
+            await asyncio.sleep(max(0.0, delay))
+
+    async def start(self, host=SERVER_HOST, port=SERVER_PORT):
+        self._server = await asyncio.start_server(self._handle_client, host, port, backlog=SERVER_BACKLOG)
+        self._ticker = asyncio.ensure_future(self._tick_loop())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._ticker.cancel()
+        self._server.close()
+        for client in list(self.clients.values()):
+            client.writer.close()
+        await self._server.wait_closed()
+
+
+class SpectatorClient:
+    """
+    Connects to a SpectatorServer and rebuilds the board from its messages: the body as
+    a deque of cells (tail left, head right), the food cell and the score.
+    """
+
+    def __init__(self):
+        self.body = collections.deque()
+        self.food = -1
+        self.score = 0
+        self.tick = 0
+        self.width = self.height = 0
+        self.snapshots = 0
+        self.games_over = 0
+        self.reader = self.writer = None
+
+    async def connect(self, host=SERVER_HOST, port=SERVER_PORT, receive_buffer=None):
+        """receive_buffer sets the socket's SO_RCVBUF, e.g. small to play a client on a slow link."""
+        if receive_buffer is None:
+            self.reader, self.writer = await asyncio.open_connection(host, port)
+            return
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+        sock.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(sock, (host, port))
+        self.reader, self.writer = await asyncio.open_connection(sock=sock, limit=receive_buffer) # asyncio's buffer too
+
+    def steer(self, direction):
+        self.writer.write({UP: b'U', DOWN: b'D', LEFT: b'L', RIGHT: b'R'}.get(direction, b'A'))
+
+    async def receive(self):
+        """Reads and applies one message. Returns its tag."""
+        reader = self.reader
+        tag = await reader.readexactly(1)
+        if tag == b'D':
+            _, tick, head, vacated, food = _DELTA.unpack(tag + await reader.readexactly(_DELTA.size - 1))
+            if tick <= self.tick:
+                return tag # Covered by the last snapshot
+            self.tick = tick
+            if vacated >= 0:
+                self.body.popleft()
+            self.body.append(head)
+            if food >= 0:
+                self.food = food # Food only moves when it is eaten
+                self.score += 1
+        elif tag == b'S':
+            header = tag + await reader.readexactly(_SNAPSHOT.size - 1)
+            _, self.tick, self.width, self.height, self.score, self.food, length = _SNAPSHOT.unpack(header)
+            cells = array('i')
+            cells.frombytes(await reader.readexactly(4 * length))
+            self.body = collections.deque(cells)
+            self.snapshots += 1
+        elif tag == b'O':
+            _, _, self.score, _ = _OVER.unpack(tag + await reader.readexactly(_OVER.size - 1))
+            self.games_over += 1
+        else:
+            raise ValueError(f"Unknown message tag {tag!r}")
+        return tag
+
+    async def close(self):
+        self.writer.close()
+
+
+async def _selftest(clients, seconds, tick_rate, slow):
+    """
+    Serves a game on loopback to `clients` spectators (plus `slow` that stop reading for a
+    while), then checks every client's board against the server's.
+    """
+    server = SpectatorServer(tick_rate=tick_rate, seed=0)
+    port = await server.start('127.0.0.1', 0)
+    spectators = [SpectatorClient() for _ in range(clients + slow)]
+    for i, spectator in enumerate(spectators):
+        # Slow clients get a tiny socket buffer, so stalling fills their queue on the server quickly
+        await spectator.connect('127.0.0.1', port, receive_buffer=1024 if i >= clients else None)
+
+    async def watch(spectator, pause):
+        try:
+            while True:
+                await spectator.receive()
+                if pause and spectator.tick >= 20:
+                    pause = False
+                    await asyncio.sleep(seconds) # Stops reading until the end; the server must not wait for it
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    watchers = [asyncio.ensure_future(watch(spectator, i >= clients)) for i, spectator in enumerate(spectators)]
+    started, first_tick = time.perf_counter(), server.tick
+    await asyncio.sleep(seconds)
+    server._ticker.cancel() # Freeze the game so the clients can catch up
+    elapsed = time.perf_counter() - started
+    ticks = server.tick - first_tick
+    while server._behind or any(spectator.tick != server.tick for spectator in spectators):
+        server._resync() # Normally done by the tick
+        await asyncio.sleep(0.05)
+
+    expected = list(server.engine.snake.get_body_cells())
+    mismatches = sum(1 for spectator in spectators
+                     if list(spectator.body) != expected or spectator.food != server._food_cell())
+    print(f"{len(spectators)} clients ({slow} slow), {ticks} ticks in {elapsed:.2f}s "
+          f"({ticks / elapsed:.1f} ticks/s, target {tick_rate}), {server.games} games, "
+          f"server {server.step_seconds / max(1, server.tick) * 1000:.2f} ms per tick (the clients share the process)")
+    print(f"  sent {server.bytes_sent / 1024:.0f} KiB ({server.bytes_sent / max(1, server.tick) / len(spectators):.1f} bytes "
+          f"per tick per client, including the join), resyncs {server.resyncs}, board mismatches {mismatches}")
+    for watcher in watchers:
+        watcher.cancel()
+    for spectator in spectators:
+        await spectator.close()
+    await server.stop()
+    return mismatches
+
+
+# --- Command-line runner ---
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream a live AI game to spectators over TCP.")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--width', type=int, default=GRID_WIDTH)
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT)
+    parser.add_argument('--tick-rate', type=float, default=SERVER_TICK_RATE, help="Ticks per second")
+    parser.add_argument('--pilot', default=AI_PILOT, help="AI playing while nobody steers")
+    parser.add_argument('--selftest', type=int, default=None, metavar='CLIENTS',
+                        help="Serve CLIENTS loopback spectators for --seconds, check their boards and quit")
+    parser.add_argument('--slow', type=int, default=10, help="Spectators in --selftest that stall reading")
+    parser.add_argument('--seconds', type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.selftest is not None:
+        raise SystemExit(1 if asyncio.run(_selftest(args.selftest, args.seconds, args.tick_rate, args.slow)) else 0)
+
+    async def serve():
+        server = SpectatorServer(args.width, args.height, args.tick_rate, args.pilot)
+        port = await server.start(args.host, args.port)
+        print(f"Serving on {args.host}:{port} at {args.tick_rate} ticks/s, Ctrl+C to stop")
+        while True:
+            await asyncio.sleep(10)
+            print(f"  tick {server.tick}, {len(server.clients)} clients, {server.games} games, "
+                  f"{server.bytes_sent / 1024:.0f} KiB sent, {server.resyncs} resyncs")
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
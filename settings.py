@@ -1,5 +1,6 @@
 # settings.py
-import pygame
+# Plain constants only: this module must stay importable without pygame so the
+# game logic can run headless.
 
 # Screen dimensions
 GRID_SIZE = 20
@@ -7,6 +8,10 @@ GRID_WIDTH = 30  # Number of grid cells horizontally
 GRID_HEIGHT = 20 # Number of grid cells vertically
 SCREEN_WIDTH = GRID_SIZE * GRID_WIDTH
 SCREEN_HEIGHT = GRID_SIZE * GRID_HEIGHT
+# Defaults; main.py takes --width/--height/--cell/--window to override them at runtime
+MAX_WINDOW_WIDTH = 1280  # Boards larger than this are shown through a scrolling camera
+MAX_WINDOW_HEIGHT = 800
+CAMERA_MARGIN = 5 # Cells kept between the snake's head and the edge of the view
 
 # Colors (RGB)
 WHITE = (255, 255, 255)
@@ -30,9 +35,66 @@ LEFT = (-1, 0)
 RIGHT = (1, 0)
 
 # Font settings
-FONT_NAME = pygame.font.match_font('arial') # Or choose a specific .ttf file
+FONT_NAME = 'arial' # System font family, resolved when the display starts
 FONT_SIZE_LARGE = 36
 FONT_SIZE_SMALL = 24
+TEXT_CACHE_SIZE = 128 # Rendered text surfaces kept for reuse (least recently used are dropped)
+FONT_CACHE_FILE = '.font_cache.json' # Resolved font paths, so the system font scan runs once; None to always scan
+
+# Audio (the game has no sounds yet; the mixer only costs startup time)
+AUDIO_ENABLED = False
 
 # AI Settings
-DEBUG_AI_PATH = False # Set to True to visualize the AI's calculated path
\ No newline at end of file
+DEBUG_AI_PATH = False # Set to True to visualize the AI's calculated path
+AI_TIME_BUDGET = None # Seconds the AutoPilot may plan per move in the game (e.g. 0.005), None for no limit
+ASTAR_MIN_DISTANCE = 12 # Manhattan distance to food above which the AI uses A* instead of BFS
+AI_PILOT = 'autopilot' # AI policy used in auto mode, see pilots.PILOTS ('autopilot', 'hamiltonian' or 'lookahead')
+HAMILTONIAN_SHORTCUT_MAX_FILL = 0.5 # Hamiltonian pilot stops taking shortcuts above this board fill
+HAMILTONIAN_SHORTCUT_MARGIN = 3 # Extra free cycle cells a shortcut must leave in front of the head
+LOOKAHEAD_ROLLOUTS = 18 # Lookahead pilot: rollouts per move, shared by the candidate moves
+LOOKAHEAD_DEPTH = 16 # Lookahead pilot: ticks simulated per rollout
+LOOKAHEAD_DISCOUNT = 0.95 # Weight of a rollout's reward per tick into the future
+LOOKAHEAD_EXPLORATION = 0.1 # Chance a rollout step is random instead of greedy towards the food
+LOOKAHEAD_DEATH_PENALTY = 10.0 # Score of a rollout that dies (plus the food it ate)
+LOOKAHEAD_TRAP_PENALTY = 5.0 # Score lost by a rollout that ends with the tail out of reach
+
+# Performance profiling (toggle the HUD in game with F3)
+PROFILER_ENABLED = False # Start with the frame profiler on
+PROFILER_TRACE_FILE = 'frame_trace.jsonl' # Per-frame phase timings while the profiler is on (None to skip)
+PROFILER_TRACE_MAX_FRAMES = 10000 # The trace rolls over to <file>.1 after this many frames
+
+# Main loop timing (the snake speed above is the simulation tick rate)
+RENDER_FPS = 60 # Frames drawn per second, independent of the tick rate
+MAX_TICKS_PER_FRAME = 5 # Catch-up limit after a slow frame; older backlog is dropped
+MAX_SPEED_BATCH_SECONDS = 0.05 # Max speed mode: simulate this long between input polls
+MAX_SPEED_DRAW_INTERVAL = 0.5 # Max speed mode: seconds between the occasional status frames
+IDLE_WAKEUP_MS = 1000 # Paused or game over: longest sleep between checks when no input arrives
+IDLE_POLL_MS = 100 # Same, on video drivers that cannot wait for events (e.g. dummy): input polling interval
+
+# Replays (see replay.py)
+REPLAY_DIR = 'replays' # Every game played in the window is recorded here (None to turn off)
+REPLAY_KEYFRAME_INTERVAL = 65536 # Steps between full-state keyframes, the seek granularity
+REPLAY_CHUNK_MOVES = 16384 # Moves buffered before they are written out (4 KB packed)
+
+# Arena mode (see arena.py)
+ARENA_WIDTH = 500
+ARENA_HEIGHT = 500
+ARENA_SNAKES = 200
+ARENA_FOOD = 1000
+ARENA_SPACE_CHECK = 32 # Arena pilot: free cells a move must lead to (capped BFS), at most snake length + 2
+ARENA_FOOD_SAMPLE = 8 # Arena pilot: food items sampled when picking the nearest target
+
+# Spectator server (see server.py)
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+SERVER_TICK_RATE = 10 # Ticks per second of the served game
+SERVER_WRITE_BUFFER = 16 * 1024 # Bytes queued per client; a client further behind is resynced with a snapshot
+SERVER_SOCKET_BUFFER = 32 * 1024 # Kernel send buffer per client (SO_SNDBUF), None for the system default
+SERVER_BACKLOG = 1024 # Pending connections the listening socket accepts
+
+# Training environment (see env.py)
+ENV_FOOD_REWARD = 1.0
+ENV_DEATH_REWARD = -1.0
+ENV_STEP_REWARD = 0.0
+ENV_MAX_STEPS = 10000 # Episodes are cut off (truncated) after this many steps, None for no limit
+ENV_WORKERS = 4 # Worker processes of a VectorEnv, 0 to step in the calling process
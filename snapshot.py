@@ -0,0 +1,65 @@
+# snapshot.py
+import random
+
+
+class SimState:
+    """
+    A game state for search: a private snake, the food cell and the score.
+    push(direction) plays one tick with the engine's rules and logs what it changed;
+    pop() undoes the last push. Both are O(1), so a rollout of any depth costs
+    nothing to take back, and only the starting snapshot copies the board.
+    Food eaten during a search respawns from the state's own rng, so rollouts never
+    disturb the real game's random sequence.
+    """
+
+    def __init__(self, snake, food_cell, rng=None):
+        self.snake = snake # Owned by this state, see from_game
+        self.food_cell = food_cell # -1 when there is no food
+        self.rng = rng if rng is not None else random.Random()
+        self.score = 0 # Food eaten since the snapshot
+        self.alive = True
+        self._log = [] # One (snake undo token, food cell, score, alive) per push
+
+    @classmethod
+    def from_game(cls, snake, food, rng=None):
+        """Snapshots a live game (one board copy); the game's objects are left untouched."""
+        food_cell = -1 if food.position is None else food.position[1] * snake.grid_width + food.position[0]
+        return cls(snake.copy(), food_cell, rng)
+
+    def clone(self):
+        """An independent copy, including the undo log."""
+        state = SimState(self.snake.copy(), self.food_cell, self.rng)
+        state.score, state.alive = self.score, self.alive
+        state._log = list(self._log)
+        return state
+
+    @property
+    def depth(self):
+        """Pushes that can still be undone."""
+        return len(self._log)
+
+    def push(self, direction):
+        """Turns and moves the snake, eats and respawns food. Returns False if the snake died."""
+        snake = self.snake
+        self._log.append((snake.undo_token(), self.food_cell, self.score, self.alive))
+        snake.turn(direction)
+        snake.move()
+        head = snake.get_head_cell()
+        if head == self.food_cell:
+            snake.grow()
+            self.score += 1
+            cell = snake.free_cells.choice(self.rng)
+            self.food_cell = -1 if cell is None else cell
+        if snake.occupancy[head] > 1:
+            self.alive = False
+        return self.alive
+
+    def pop(self):
+        """Undoes the last push."""
+        token, self.food_cell, self.score, self.alive = self._log.pop()
+        self.snake.undo_move(token)
+
+    def rewind(self, depth=0):
+        """Undoes pushes until only `depth` remain."""
+        while len(self._log) > depth:
+            self.pop()
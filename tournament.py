@@ -0,0 +1,126 @@
+# tournament.py
+import argparse
+import json
+import random
+import statistics
+import time
+from multiprocessing import Pool
+from settings import *
+from engine import GameEngine
+from pilots import PILOTS, create_pilot
+
+
+def play_game(task):
+    """
+    Plays one seeded headless game and returns its result record.
+    task is (seed, pilot_name, grid_width, grid_height, max_steps, time_budget); the same
+    task always produces the same result, unless a time budget makes moves depend on timing.
+    """
+    seed, pilot_name, grid_width, grid_height, max_steps, time_budget = task
+    engine = GameEngine(grid_width, grid_height, rng=random.Random(seed))
+    pilot = create_pilot(pilot_name, grid_width, grid_height, verbose=False, time_budget=time_budget)
+    tiers = {}
+
+    steps_to_food = []
+    last_food_step = 0
+    started = time.perf_counter()
+    while not engine.game_over and engine.steps < max_steps:
+        engine.step(pilot.get_next_move(engine.snake, engine.food))
+        tier = getattr(pilot, 'last_tier', None)
+        if tier is not None:
+            tiers[tier] = tiers.get(tier, 0) + 1
+        if engine.ate_food:
+            steps_to_food.append(engine.steps - last_food_step)
+            last_food_step = engine.steps
+    elapsed = time.perf_counter() - started
+
+    if engine.won:
+        cause = 'win'
+    elif not engine.game_over:
+        cause = 'timeout'
+    elif getattr(pilot, 'trapped', False):
+        cause = 'trapped' # The AI had no valid move left before the collision
+    else:
+        cause = engine.death_cause
+    return {
+        'seed': seed,
+        'score': engine.score,
+        'steps': engine.steps,
+        'cause': cause,
+        'mean_steps_to_food': statistics.fmean(steps_to_food) if steps_to_food else None,
+        'max_steps_to_food': max(steps_to_food) if steps_to_food else None,
+        'seconds': elapsed,
+        'tiers': tiers, # Moves per AutoPilot strategy tier
+    }
+
+
+def summarize(results):
+    """Aggregates a list of game results into summary statistics."""
+    scores = [r['score'] for r in results]
+    steps = [r['steps'] for r in results]
+    food_gaps = [r['mean_steps_to_food'] for r in results if r['mean_steps_to_food'] is not None]
+    causes = {}
+    tiers = {}
+    for r in results:
+        causes[r['cause']] = causes.get(r['cause'], 0) + 1
+        for tier, count in r['tiers'].items():
+            tiers[tier] = tiers.get(tier, 0) + count
+    total_seconds = sum(r['seconds'] for r in results)
+    return {
+        'games': len(results),
+        'score_mean': statistics.fmean(scores),
+        'score_median': statistics.median(scores),
+        'score_stdev': statistics.pstdev(scores),
+        'score_min': min(scores),
+        'score_max': max(scores),
+        'steps_mean': statistics.fmean(steps),
+        'steps_to_food_mean': statistics.fmean(food_gaps) if food_gaps else None,
+        'causes': causes,
+        'tiers': tiers,
+        'steps_per_second': sum(steps) / total_seconds if total_seconds else None,
+    }
+
+
+def run_tournament(pilot_name, seeds, grid_width, grid_height, max_steps, workers=None, time_budget=None):
+    """Plays one game per seed on a process pool. Results come back ordered by seed."""
+    tasks = [(seed, pilot_name, grid_width, grid_height, max_steps, time_budget) for seed in seeds]
+    with Pool(workers) as pool:
+        results = list(pool.imap_unordered(play_game, tasks))
+    results.sort(key=lambda r: r['seed'])
+    return results
+
+
+# --- Command-line runner ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play many seeded headless games with an AI pilot on all cores.")
+    parser.add_argument('--pilot', choices=list(PILOTS), default=AI_PILOT)
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--width', type=int, default=GRID_WIDTH)
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT)
+    parser.add_argument('--max-steps', type=int, default=20000, help="Games still running after this many ticks end as 'timeout'")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--time-budget-ms', type=float, default=None, help="Per-move planning budget (AutoPilot tiers)")
+    parser.add_argument('--output', default='tournament_results.json', help="Machine-readable results file")
+    args = parser.parse_args()
+
+    seeds = range(args.first_seed, args.first_seed + args.games)
+    started = time.perf_counter()
+    time_budget = args.time_budget_ms / 1000 if args.time_budget_ms is not None else None
+    results = run_tournament(args.pilot, seeds, args.width, args.height, args.max_steps, args.workers, time_budget)
+    wall_time = time.perf_counter() - started
+    summary = summarize(results)
+
+    with open(args.output, 'w') as f:
+        json.dump({'config': vars(args), 'summary': summary, 'games': results}, f, indent=1)
+
+    print(f"{args.pilot} on {args.width}x{args.height}, {summary['games']} games in {wall_time:.1f}s")
+    print(f"  score: mean {summary['score_mean']:.1f}, median {summary['score_median']}, "
+          f"stdev {summary['score_stdev']:.1f}, range {summary['score_min']}-{summary['score_max']}")
+    print(f"  steps survived: mean {summary['steps_mean']:.0f}")
+    if summary['steps_to_food_mean'] is not None:
+        print(f"  steps to food: mean {summary['steps_to_food_mean']:.1f}")
+    print("  outcomes: " + ", ".join(f"{cause} {count}" for cause, count in sorted(summary['causes'].items())))
+    if summary['tiers']:
+        print("  move tiers: " + ", ".join(f"{tier} {count}" for tier, count in sorted(summary['tiers'].items())))
+    print(f"Results written to {args.output}")